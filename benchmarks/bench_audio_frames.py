@@ -0,0 +1,55 @@
+"""Bytes on the wire and server CPU per second of TTS audio: base64-in-JSON relay
+vs binary frames.
+
+    python benchmarks/bench_audio_frames.py [--bitrate-kbps 128] [--chunk-ms 250]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.audio_frames import pack_audio_frame  # noqa: E402
+
+
+def json_relay(murf_message: str, seq: int):
+    response = json.loads(murf_message)
+    return json.dumps({"type": "audio", "data": response["audio"]})
+
+
+def binary_relay(murf_message: str, seq: int):
+    response = json.loads(murf_message)
+    return pack_audio_frame(seq, "MP3", response["audio"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bitrate-kbps", type=int, default=128)
+    parser.add_argument("--chunk-ms", type=int, default=250)
+    parser.add_argument("--seconds", type=int, default=600, help="seconds of audio to relay")
+    args = parser.parse_args()
+
+    chunk_bytes = args.bitrate_kbps * 1000 // 8 * args.chunk_ms // 1000
+    chunks_per_second = 1000 / args.chunk_ms
+    murf_message = json.dumps(
+        {"audio": base64.b64encode(os.urandom(chunk_bytes)).decode(), "context_id": "ctx"}
+    )
+    n = int(args.seconds * chunks_per_second)
+
+    for name, relay in (("json+base64", json_relay), ("binary frame", binary_relay)):
+        frame = relay(murf_message, 0)
+        start = time.perf_counter()
+        for seq in range(n):
+            relay(murf_message, seq)
+        cpu_per_audio_second = (time.perf_counter() - start) / args.seconds
+        wire = len(frame if isinstance(frame, bytes) else frame.encode()) * chunks_per_second
+        print(
+            f"{name:13s}: {wire / 1024:7.1f} KiB/s on wire, "
+            f"{cpu_per_audio_second * 1e6:7.1f} us CPU per second of audio"
+        )
+
+
+if __name__ == "__main__":
+    main()
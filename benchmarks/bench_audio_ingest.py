@@ -0,0 +1,85 @@
+"""Event-loop stall from forwarding microphone audio: calling a slow blocking
+send inline (the old `client.stream` call) vs pushing into AudioIngestor.
+
+Simulates N sessions streaming small frames while the upstream send takes
+`--send-ms` per call, and reports the loop lag seen by a timer task.
+
+    python benchmarks/bench_audio_ingest.py [--sessions 20] [--frame-ms 20] [--send-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.audio_ingest import BYTES_PER_MS, AudioIngestor  # noqa: E402
+
+
+def slow_send(send_ms: float, calls: list):
+    def send(packet: bytes):
+        calls.append(len(packet))
+        time.sleep(send_ms / 1000)
+    return send
+
+
+async def measure_lag(stop: asyncio.Event, samples: list, interval: float = 0.01):
+    while not stop.is_set():
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - scheduled))
+
+
+async def run(mode: str, args) -> dict:
+    frame = os.urandom(args.frame_ms * BYTES_PER_MS)
+    calls: list = []
+    send = slow_send(args.send_ms, calls)
+    ingestors = [AudioIngestor(send) for _ in range(args.sessions)] if mode == "ingestor" else []
+    stop = asyncio.Event()
+    lag: list = []
+    monitor = asyncio.create_task(measure_lag(stop, lag))
+
+    async def session(i: int):
+        for _ in range(int(args.seconds * 1000 / args.frame_ms)):
+            if mode == "inline":
+                send(frame)
+            else:
+                ingestors[i].push(frame)
+            await asyncio.sleep(args.frame_ms / 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(args.sessions)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await monitor
+    for ingestor in ingestors:
+        await asyncio.to_thread(ingestor.close)
+    dropped = sum(i.stats["bytes_dropped"] for i in ingestors)
+    lag.sort()
+    return {
+        "wall": wall,
+        "lag_p50": lag[len(lag) // 2],
+        "lag_p99": lag[int(len(lag) * 0.99)],
+        "sends": len(calls),
+        "dropped": dropped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--send-ms", type=float, default=5.0, help="simulated upstream send time")
+    parser.add_argument("--seconds", type=float, default=3.0, help="audio per session")
+    args = parser.parse_args()
+
+    for mode in ("inline", "ingestor"):
+        r = asyncio.run(run(mode, args))
+        print(
+            f"{mode:9s} wall {r['wall']:5.2f}s  loop lag p50 {r['lag_p50'] * 1000:7.2f} ms  "
+            f"p99 {r['lag_p99'] * 1000:7.2f} ms  upstream sends {r['sends']:6d}  dropped {r['dropped']} B"
+        )
+
+
+if __name__ == "__main__":
+    main()
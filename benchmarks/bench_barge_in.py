@@ -0,0 +1,153 @@
+"""Barge-in harness: measure cancel-to-silence latency and wasted upstream work
+with fake Gemini and Murf upstreams (no API keys needed).
+
+    python benchmarks/bench_barge_in.py [--runs 10] [--interrupt-after-ms 300]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+import services.murf_pool as murf_pool_module  # noqa: E402
+from services.turns import TurnController  # noqa: E402
+
+SENTENCE_DELAY = 0.03
+AUDIO_CHUNKS_PER_SENTENCE = 5
+AUDIO_CHUNK_DELAY = 0.02
+
+counters = {"gemini_chunks_after_cancel": 0, "murf_chunks_after_clear": 0}
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGemini:
+    """Blocking streaming model; counts chunks produced after the turn was cancelled."""
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    def generate_content(self, prompt, stream=False):
+        if not stream:
+            return FakeChunk("summary")
+        return self._stream()
+
+    def _stream(self):
+        for i in range(200):
+            time.sleep(SENTENCE_DELAY)
+            if self.cancelled.is_set():
+                counters["gemini_chunks_after_cancel"] += 1
+            yield FakeChunk(f"This is sentence number {i}. ")
+
+
+async def fake_murf(ws):
+    cleared = set()
+    streams = []
+
+    async def stream_audio(context_id, final):
+        for _ in range(AUDIO_CHUNKS_PER_SENTENCE):
+            await asyncio.sleep(AUDIO_CHUNK_DELAY)
+            if context_id in cleared:
+                return
+            await ws.send(json.dumps({"audio": base64.b64encode(context_id.encode()).decode(), "context_id": context_id}))
+        if final:
+            await ws.send(json.dumps({"final": True, "context_id": context_id}))
+
+    try:
+        async for raw in ws:
+            message = json.loads(raw)
+            context_id = message.get("context_id")
+            if message.get("clear"):
+                cleared.add(context_id)
+            elif "text" in message:
+                if context_id in cleared:
+                    counters["murf_chunks_after_clear"] += 1
+                streams.append(asyncio.create_task(stream_audio(context_id, message.get("end"))))
+    finally:
+        for task in streams:
+            task.cancel()
+
+
+class FakeClient:
+    """Stands in for the browser WebSocket and timestamps everything it receives."""
+
+    client = ("127.0.0.1", 50000)
+
+    def __init__(self):
+        self.events = []
+
+    async def send_text(self, text):
+        self.events.append((time.perf_counter(), json.loads(text)))
+
+    async def send_bytes(self, data):
+        self.events.append((time.perf_counter(), {"type": "audio_bytes"}))
+
+
+async def run_once(interrupt_after: float):
+    client = FakeClient()
+    model = FakeGemini()
+    loop = asyncio.get_running_loop()
+    turns = TurnController(loop, lambda: client.send_text(json.dumps({"type": "audio_interrupt"})))
+    session_id = f"barge-in-{uuid.uuid4().hex}"
+
+    await asyncio.wrap_future(turns.start(main.get_llm_response_stream("tell me a story", client, session_id, model)))
+    await asyncio.sleep(interrupt_after)
+
+    cancel_at = time.perf_counter()
+    model.cancelled.set()
+    # Barge in with a short joke turn that finishes on its own.
+    await asyncio.wrap_future(turns.start(main.get_llm_response_stream("tell me a joke", client, session_id, model)))
+    interrupt_at = next(t for t, e in client.events if e["type"] == "audio_interrupt")
+    await asyncio.sleep(0.5)
+    await turns.close()
+
+    first_turn_contexts = set()
+    stale_after_interrupt = 0
+    seen_interrupt = False
+    for t, event in client.events:
+        if event["type"] == "audio_interrupt":
+            seen_interrupt = True
+        elif event["type"] == "audio":
+            context = base64.b64decode(event["data"]).decode()
+            if not seen_interrupt:
+                first_turn_contexts.add(context)
+            elif context in first_turn_contexts:
+                stale_after_interrupt += 1
+    return interrupt_at - cancel_at, stale_after_interrupt
+
+
+async def run(args):
+    async with websockets.serve(fake_murf, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        murf_pool_module.MURF_STREAM_URL = f"ws://127.0.0.1:{port}"
+        latencies, stale = [], 0
+        for _ in range(args.runs):
+            latency, stale_frames = await run_once(args.interrupt_after_ms / 1000)
+            latencies.append(latency * 1000)
+            stale += stale_frames
+        await main.murf_pool.close()
+    print(f"cancel-to-silence: p50 {statistics.median(latencies):.1f} ms, max {max(latencies):.1f} ms")
+    print(f"stale audio frames after interrupt: {stale}")
+    print(f"Gemini chunks read after cancel:    {counters['gemini_chunks_after_cancel']}")
+    print(f"Murf text sent after context clear: {counters['murf_chunks_after_clear']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--interrupt-after-ms", type=int, default=300)
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run(parser.parse_args()))
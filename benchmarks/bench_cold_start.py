@@ -0,0 +1,93 @@
+"""Cold-start budget check: import time of main.py and time until uvicorn serves.
+
+Runs `python -X importtime -c "import main"` in fresh interpreters, reports
+the median cumulative import time and the heaviest direct imports, then
+starts `uvicorn main:app` and times the first successful /metrics response.
+Exits non-zero when the median import time exceeds --budget-ms, so it can
+guard cold start as more skills are added.
+
+    python benchmarks/bench_cold_start.py [--runs 5] [--budget-ms 1000]
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def import_profile():
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stderr
+    total, children = None, {}
+    for line in out.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        cumulative_us, depth, name = int(m.group(2)), len(m.group(3)) // 2, m.group(4)
+        if name == "main" and depth == 0:
+            total = cumulative_us
+        elif depth == 1:
+            children[name] = cumulative_us
+    return total / 1000, {k: v / 1000 for k, v in children.items()}
+
+
+def time_to_serve() -> float:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < 30:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=0.5).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.HTTPError:
+                time.sleep(0.02)
+        raise RuntimeError("server did not come up")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    totals, per_module = [], {}
+    for _ in range(args.runs):
+        total, children = import_profile()
+        totals.append(total)
+        for name, ms in children.items():
+            per_module.setdefault(name, []).append(ms)
+    median = statistics.median(totals)
+    print(f"import main: median {median:.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    heaviest = sorted(per_module.items(), key=lambda kv: -statistics.median(kv[1]))[: args.top]
+    for name, samples in heaviest:
+        print(f"  {statistics.median(samples):7.1f} ms  {name}")
+
+    serve = statistics.median(time_to_serve() for _ in range(max(1, args.runs // 2)))
+    print(f"uvicorn spawn -> first /metrics response: {serve * 1000:.0f} ms")
+    if median > args.budget_ms:
+        print("OVER BUDGET")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
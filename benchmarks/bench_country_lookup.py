@@ -0,0 +1,45 @@
+"""Compare the precomputed country index against the old linear pycountry scan.
+
+    python benchmarks/bench_country_lookup.py
+"""
+import os
+import sys
+import timeit
+
+import pycountry
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.countries import build_index, extract_country_code  # noqa: E402
+
+MESSAGES = [
+    "what's the latest news in india",
+    "give me headlines from the united states please",
+    "any news today",
+    "tell me the top headlines about guinea-bissau",
+    "latest updates from the uk",
+    "news",
+]
+
+
+def linear_scan(user_message: str):
+    for country in pycountry.countries:
+        if country.name.lower() in user_message.lower():
+            return country.alpha_2.lower()
+        if hasattr(country, "official_name") and country.official_name.lower() in user_message.lower():
+            return country.alpha_2.lower()
+    for alias, code in {"usa": "us", "uk": "gb", "uae": "ae"}.items():
+        if alias in user_message.lower():
+            return code
+    return None
+
+
+def main(number: int = 2000):
+    build_index()
+    for name, fn in (("linear scan", linear_scan), ("token index", extract_country_code)):
+        seconds = timeit.timeit(lambda: [fn(m) for m in MESSAGES], number=number)
+        per_call_us = seconds / (number * len(MESSAGES)) * 1e6
+        print(f"{name:12s}: {per_call_us:8.2f} us/message")
+
+
+if __name__ == "__main__":
+    main()
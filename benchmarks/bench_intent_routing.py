@@ -0,0 +1,54 @@
+"""Per-turn intent routing cost: old chained is_*_intent checks vs IntentRouter.
+
+    python benchmarks/bench_intent_routing.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import intent_router  # noqa: E402
+
+CORPUS = [
+    "what's the weather in Vijayawada",
+    "weather Hyderabad please",
+    "in London",
+    "give me the latest news from india",
+    "any headlines today",
+    "tell me a joke",
+    "make me laugh",
+    "what is the capital of France",
+    "can you explain how photosynthesis works in simple terms",
+    "hello there, how are you doing today",
+]
+
+
+def chained(text: str):
+    if re.search(r"\b(weather|forecast|temperature)\b", text, re.IGNORECASE) or re.match(
+        r"^\s*(in|at)\s+\w+", text, re.IGNORECASE
+    ):
+        return "weather"
+    if any(word in text.lower() for word in ["news", "headlines", "latest updates"]):
+        return "news"
+    if any(word in text.lower() for word in ["joke", "funny", "make me laugh", "laugh"]):
+        return "joke"
+    return None
+
+
+def routed(text: str):
+    hits = intent_router.scan(text)
+    return min(hits, key=lambda n: (-hits[n], intent_router.intents[n].priority)) if hits else None
+
+
+def main(number: int = 5000):
+    for text in CORPUS:
+        assert chained(text) == routed(text), text
+    for name, fn in (("chained checks", chained), ("intent router", routed)):
+        seconds = timeit.timeit(lambda: [fn(t) for t in CORPUS], number=number)
+        per_turn_us = seconds / (number * len(CORPUS)) * 1e6
+        print(f"{name:14s}: {per_turn_us:6.2f} us/turn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Lookup cost and paraphrase hit rate of ResponseCache.
+
+Fills the cache with `--entries` distinct general questions, then looks up
+paraphrases of cached questions (should hit) and unrelated or numerically
+different questions (must miss).
+
+    python benchmarks/bench_response_cache.py [--entries 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.response_cache import ResponseCache  # noqa: E402
+
+TOPICS = [
+    "capital of france", "height of mount everest", "speed of light", "inventor of the telephone",
+    "population of india", "boiling point of water", "author of hamlet", "distance to the moon",
+    "largest ocean on earth", "meaning of photosynthesis", "history of the roman empire",
+    "how do vaccines work", "why is the sky blue", "tallest building in dubai",
+]
+PARAPHRASES = ["what is the {}", "tell me the {} please", "{}", "hey what's the {}", "the {}s"]
+MISSES = ["what is 17 plus 4", "capital of germany", "tell me more about it", "how do airplanes fly"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    cache = ResponseCache("bench", ttls={"llm": 3600}, max_entries=args.entries + len(TOPICS))
+    rng = random.Random(0)
+    for i in range(args.entries):
+        cache.put("friendly", "llm", f"what is {i} times {rng.randint(2, 99)}", "answer")
+    for topic in TOPICS:
+        cache.put("friendly", "llm", f"what is the {topic}", f"about {topic}")
+
+    queries = [(rng.choice(PARAPHRASES).format(rng.choice(TOPICS)), True) for _ in range(args.lookups)]
+    queries += [(q, False) for q in MISSES]
+
+    false_hits = hits = 0
+    started = time.perf_counter()
+    for query, should_hit in queries:
+        reply = cache.get("friendly", "llm", query)
+        hits += reply is not None and should_hit
+        false_hits += reply is not None and not should_hit
+    elapsed = time.perf_counter() - started
+
+    print(f"entries: {len(cache)}  lookups: {len(queries)}")
+    print(f"cost: {elapsed / len(queries) * 1e6:.1f} us/lookup")
+    print(f"paraphrase hit rate: {hits / args.lookups:.1%}  false hits: {false_hits}/{len(MISSES)}")
+    print(f"stats: {cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Throughput of the streaming SentenceSegmenter vs re-splitting the whole buffer.
+
+    python benchmarks/bench_segmenter.py
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.segmenter import SentenceSegmenter  # noqa: E402
+
+SENTENCE = "The quick brown fox, who was rather tired, jumped over the lazy dog at 3.5 p.m. today. "
+CHUNK_CHARS = 24
+
+
+def resplit(chunks):
+    sentence_buffer = ""
+    accum = ""
+    out = []
+    for chunk in chunks:
+        sentence_buffer += chunk
+        accum += chunk
+        sentences = re.split(r"(?<=[.?!])\s+", sentence_buffer)
+        if len(sentences) > 1:
+            out.extend(s.strip() for s in sentences[:-1] if s.strip())
+            sentence_buffer = sentences[-1]
+    return out
+
+
+def streaming(chunks):
+    segmenter = SentenceSegmenter(first_clause_ms=None)
+    parts = []
+    out = []
+    for chunk in chunks:
+        parts.append(chunk)
+        out.extend(segmenter.feed(chunk))
+    "".join(parts)
+    return out
+
+
+def main():
+    for sentences in (10, 100, 1000):
+        text = SENTENCE * sentences
+        chunks = [text[i:i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)]
+        for name, fn in (("re.split buffer", resplit), ("segmenter", streaming)):
+            start = time.perf_counter()
+            fn(chunks)
+            seconds = time.perf_counter() - start
+            print(f"{sentences:5d} sentences  {name:15s}: {len(text) / seconds / 1e6:6.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
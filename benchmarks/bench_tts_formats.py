@@ -0,0 +1,109 @@
+"""Bytes per second of speech and time to first audible sample, per TTS format.
+
+Synthesizes the same reply through the Murf socket pool in each negotiable
+format/sample rate and reports, per format:
+
+  * first chunk   - Murf request -> first audio chunk at the server
+  * bytes/s       - wire bytes per second of speech, as relayed to the client
+  * first audible - first chunk + sending the first client frame over a link
+                    of --link-kbps + the time before that frame can sound
+                    (MP3's 1105-sample encoder/decoder delay; PCM plays as is)
+
+The link and codec-delay terms are modeled; the rest is measured. The
+browser's decodeAudioData time for each MP3 chunk is not included, so MP3
+figures are a lower bound. Runs against the local fake Murf by default
+(sizes match each codec's bitrate, timings are fake); with --real it uses
+MURF_API_KEY against the real service.
+
+    python benchmarks/bench_tts_formats.py [--link-kbps 1000] [--runs 5]
+    python benchmarks/bench_tts_formats.py --real --link-kbps 400
+"""
+import argparse
+import asyncio
+import base64
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import load_test  # noqa: E402
+
+FORMATS = [("MP3", 44100), ("MP3", 24000), ("MP3", 8000), ("PCM", 24000), ("PCM", 8000)]
+MP3_CODEC_DELAY_SAMPLES = 1105
+TEXT = "Paris is the capital of France. It is famous for art, food, and the Eiffel Tower."
+
+
+async def synthesize(murf_pool, api_key, output):
+    from services.tts_formats import AudioFramer, mp3_bitrate
+
+    framer = AudioFramer(output)
+    ctx = await murf_pool.acquire(api_key, output.voice, output.style, output.sample_rate, output.fmt)
+    try:
+        started = time.perf_counter()
+        await ctx.send_text(TEXT, end=True)
+        first_chunk_at, first_frame, audio = None, None, b""
+        while True:
+            response = await asyncio.wait_for(ctx.recv(), timeout=30)
+            if response is None:
+                break
+            if response.get("audio"):
+                chunk = base64.b64decode(response["audio"])
+                frames = framer.frames(chunk)
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter() - started
+                    first_frame = frames[0] if frames else chunk
+                audio += chunk
+            if response.get("final"):
+                break
+    finally:
+        ctx.release()
+    if output.fmt == "PCM":
+        seconds = len(audio) / 2 / output.sample_rate
+    else:
+        seconds = len(audio) * 8 / (mp3_bitrate(audio) or 1)
+    return first_chunk_at, first_frame, len(audio), seconds
+
+
+async def run(args, api_key):
+    from services.murf_pool import murf_pool
+    from services.tts_formats import TtsOutput
+
+    print(f"{'format':>12} {'first chunk':>12} {'bytes/s':>9} {'first frame':>12} {'first audible':>14}")
+    for fmt, rate in FORMATS:
+        output = TtsOutput(args.voice, fmt=fmt, sample_rate=rate)
+        samples = [await synthesize(murf_pool, api_key, output) for _ in range(args.runs)]
+        first_chunk = statistics.median(s[0] for s in samples)
+        frame_bytes = statistics.median(len(s[1]) for s in samples)
+        rate_bps = sum(s[2] for s in samples) / sum(s[3] for s in samples)
+        transfer = frame_bytes * 8 / (args.link_kbps * 1000)
+        codec_delay = MP3_CODEC_DELAY_SAMPLES / rate if fmt == "MP3" else 0.0
+        audible = first_chunk + transfer + codec_delay
+        print(
+            f"{fmt + ' ' + str(rate // 1000) + 'k':>12} {first_chunk * 1000:9.0f} ms {rate_bps:9.0f} "
+            f"{frame_bytes:9.0f} B {audible * 1000:11.0f} ms"
+        )
+    await murf_pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--link-kbps", type=float, default=1000, help="client downlink for the transfer term")
+    parser.add_argument("--voice", default="en-IN-isha")
+    parser.add_argument("--real", action="store_true", help="use the real Murf API (MURF_API_KEY)")
+    args = parser.parse_args()
+
+    if args.real:
+        api_key = os.environ["MURF_API_KEY"]
+    else:
+        port = load_test.free_port()
+        load_test.start_fakes(port)
+        os.environ["MURF_STREAM_URL"] = f"ws://127.0.0.1:{port}/murf"
+        api_key = "fake"
+    asyncio.run(run(args, api_key))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Local stand-ins for AssemblyAI, Gemini, Murf, Open-Meteo and NewsAPI.
+
+One Starlette app serves every fake so the real `main:app` can be pointed at
+it through config.py's endpoint overrides (see `app_env`). Latencies are
+configurable so the load test can model slow upstreams.
+"""
+import asyncio
+import base64
+import itertools
+import json
+import os
+import struct
+import time
+from dataclasses import dataclass
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+
+# Each fake Murf chunk carries this much speech, encoded in the socket's format.
+MURF_CHUNK_AUDIO_SECONDS = 0.25
+MP3_KBPS = {48000: 128, 44100: 128, 24000: 64, 22050: 64, 16000: 32, 8000: 16}
+_MP3_VERSIONS = {  # sample rate -> (version bits, sample-rate index)
+    44100: (3, 0), 48000: (3, 1), 22050: (2, 0), 24000: (2, 1), 16000: (2, 2), 8000: (0, 2),
+}
+_MP3_BITRATE_INDEX = {
+    3: {128: 9},
+    2: {64: 8, 32: 4},
+    0: {16: 2},
+}
+
+SCRIPT = [
+    "What's the weather in Paris",
+    "Tell me the latest news from India",
+    "Tell me a joke",
+    "What is the capital of France and why is it famous",
+]
+
+
+@dataclass
+class Latencies:
+    stt_final: float = 0.15  # end of utterance audio -> formatted final turn
+    gemini_first_token: float = 0.35
+    gemini_chunk: float = 0.05
+    murf_first_audio: float = 0.2
+    murf_chunk: float = 0.05
+    http: float = 0.08
+    utterance_seconds: float = 2.0  # audio per user turn before the fake STT ends it
+
+
+latencies = Latencies()
+_session_counter = itertools.count()
+
+
+async def fake_assemblyai(ws: WebSocket):
+    """Emit a scripted turn each time `utterance_seconds` of audio has arrived."""
+    await ws.accept()
+    session = next(_session_counter)
+    await ws.send_text(json.dumps({"type": "Begin", "id": f"fake-{session}", "expires_at": int(time.time()) + 3600}))
+    received = 0
+    turn_order = 0
+    utterance_bytes = int(latencies.utterance_seconds * BYTES_PER_SECOND)
+
+    async def emit_turn(order: int, text: str):
+        words = text.split()
+        for i in range(1, len(words) + 1):
+            await ws.send_text(json.dumps(_turn(order, " ".join(words[:i]).lower(), False, False)))
+        await ws.send_text(json.dumps(_turn(order, text.lower(), True, False)))
+        await asyncio.sleep(latencies.stt_final)
+        await ws.send_text(json.dumps(_turn(order, text + ".", True, True)))
+
+    try:
+        while True:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                received += len(message["bytes"])
+                if received >= utterance_bytes:
+                    received = 0
+                    text = SCRIPT[(session + turn_order) % len(SCRIPT)]
+                    asyncio.create_task(emit_turn(turn_order, text))
+                    turn_order += 1
+            elif message.get("text") and "Terminate" in message["text"]:
+                await ws.send_text(json.dumps({"type": "Termination", "audio_duration_seconds": 0}))
+                break
+    except WebSocketDisconnect:
+        pass
+
+
+def _turn(order: int, transcript: str, end_of_turn: bool, formatted: bool) -> dict:
+    return {
+        "type": "Turn",
+        "turn_order": order,
+        "turn_is_formatted": formatted,
+        "end_of_turn": end_of_turn,
+        "transcript": transcript,
+        "end_of_turn_confidence": 0.9,
+        "words": [],
+    }
+
+
+def _gemini_candidate(text: str) -> str:
+    return json.dumps({"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}]})
+
+
+async def fake_gemini(request: Request):
+    """REST `generateContent` / `streamGenerateContent` (JSON-array streaming)."""
+    reply = [
+        "Paris is the capital of France. ",
+        "It is famous for art, food, and the Eiffel Tower. ",
+        "Would you like to know more?",
+    ]
+    if not request.url.path.endswith(":streamGenerateContent"):
+        await asyncio.sleep(latencies.gemini_first_token)
+        return JSONResponse(json.loads(_gemini_candidate("".join(reply))))
+
+    async def body():
+        yield "["
+        await asyncio.sleep(latencies.gemini_first_token)
+        for i, text in enumerate(reply):
+            if i:
+                yield ","
+                await asyncio.sleep(latencies.gemini_chunk)
+            yield _gemini_candidate(text)
+        yield "]"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def murf_chunk(fmt: str, sample_rate: int) -> bytes:
+    """MURF_CHUNK_AUDIO_SECONDS of noise: 16-bit PCM, or mono Layer III frames."""
+    if fmt != "MP3":
+        return os.urandom(int(sample_rate * MURF_CHUNK_AUDIO_SECONDS) * 2)
+    version, rate_index = _MP3_VERSIONS[sample_rate]
+    kbps = MP3_KBPS[sample_rate]
+    header = struct.pack(
+        ">I",
+        0xFFE00000 | version << 19 | 1 << 17 | 1 << 16
+        | _MP3_BITRATE_INDEX[version][kbps] << 12 | rate_index << 10 | 3 << 6,
+    )
+    frame_samples = 1152 if version == 3 else 576
+    frame_bytes = frame_samples // 8 * kbps * 1000 // sample_rate
+    frames = int(sample_rate * MURF_CHUNK_AUDIO_SECONDS / frame_samples) + 1
+    return b"".join(header + os.urandom(frame_bytes - 4) for _ in range(frames))
+
+
+async def fake_murf(ws: WebSocket):
+    """Stream-input TTS: a few audio chunks per text message, `final` after `end`.
+
+    Messages on one context are synthesized in order, as Murf does; an empty
+    text (just closing the context) produces no audio.
+    """
+    await ws.accept()
+    cleared = set()
+    tasks = []
+    last_task = {}
+    fmt = ws.query_params.get("format", "MP3")
+    chunk = base64.b64encode(murf_chunk(fmt, int(ws.query_params.get("sample_rate", 44100)))).decode()
+
+    async def synthesize(context_id: str, text: str, end: bool, previous):
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        if text.strip():
+            await asyncio.sleep(latencies.murf_first_audio)
+            for _ in range(4):
+                if context_id in cleared:
+                    return
+                await ws.send_text(json.dumps({"audio": chunk, "context_id": context_id}))
+                await asyncio.sleep(latencies.murf_chunk)
+        if end and context_id not in cleared:
+            await ws.send_text(json.dumps({"final": True, "context_id": context_id}))
+
+    try:
+        while True:
+            message = json.loads(await ws.receive_text())
+            context_id = message.get("context_id")
+            if message.get("clear"):
+                cleared.add(context_id)
+            elif "text" in message:
+                task = asyncio.create_task(
+                    synthesize(context_id, message["text"], message.get("end", False), last_task.get(context_id))
+                )
+                last_task[context_id] = task
+                tasks.append(task)
+                tasks = [t for t in tasks if not t.done()]
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def fake_geocoding(request: Request):
+    await asyncio.sleep(latencies.http)
+    return JSONResponse({"results": [{"latitude": 48.85, "longitude": 2.35}]})
+
+
+async def fake_forecast(request: Request):
+    await asyncio.sleep(latencies.http)
+    return JSONResponse(
+        {
+            "current_weather": {"temperature": 21.0, "windspeed": 9.0},
+            "daily": {
+                "time": ["2026-01-01", "2026-01-02", "2026-01-03"],
+                "temperature_2m_max": [22, 23, 24],
+                "temperature_2m_min": [12, 13, 14],
+                "precipitation_sum": [0, 1.2, 0],
+            },
+        }
+    )
+
+
+async def fake_news(request: Request):
+    await asyncio.sleep(latencies.http)
+    return JSONResponse({"status": "ok", "articles": [{"title": f"Headline {i}"} for i in range(3)]})
+
+
+app = Starlette(
+    routes=[
+        WebSocketRoute("/v3/ws", fake_assemblyai),
+        WebSocketRoute("/murf", fake_murf),
+        Route("/v1beta/models/{call:path}", fake_gemini, methods=["POST"]),
+        Route("/v1/search", fake_geocoding),
+        Route("/v1/forecast", fake_forecast),
+        Route("/v2/{endpoint}", fake_news),
+    ]
+)
+
+
+def app_env(host: str, port: int) -> dict:
+    """Environment variables that point main:app at these fakes."""
+    base = f"{host}:{port}"
+    return {
+        "ASSEMBLYAI_API_KEY": "fake",
+        "GEMINI_API_KEY": "fake",
+        "MURF_API_KEY": "fake",
+        "NEWS_API_KEY": "fake",
+        "ASSEMBLYAI_API_HOST": f"ws://{base}",
+        "GEMINI_API_ENDPOINT": f"http://{base}",
+        "MURF_STREAM_URL": f"ws://{base}/murf",
+        "GEOCODING_URL": f"http://{base}/v1/search",
+        "FORECAST_URL": f"http://{base}/v1/forecast",
+        "NEWS_API_URL": f"http://{base}/v2",
+    }
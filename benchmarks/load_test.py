@@ -0,0 +1,280 @@
+"""Replay load test for the /ws voice pipeline against local fake upstreams.
+
+Starts benchmarks/fake_upstreams.py in-process, launches `uvicorn main:app`
+as a subprocess pointed at the fakes, then drives N concurrent /ws clients
+that stream PCM audio and wait for each spoken reply.
+
+    python benchmarks/load_test.py --sessions 50 --turns 3
+    python benchmarks/load_test.py --sessions 200 --pcm recording.pcm --speed 4
+
+Reports sessions/sec, time-to-first-audio percentiles, server event-loop lag
+(from /metrics) and resident memory per session. No API keys needed. With
+--workers N, history is checked through /agent/chat/history, which any worker
+may answer, to confirm session state is shared.
+
+    python benchmarks/load_test.py --sessions 50 --workers 1
+    python benchmarks/load_test.py --sessions 50 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import httpx
+import uvicorn
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_upstreams  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRAME_SAMPLES = 4096  # same as the browser ScriptProcessor
+FRAME_BYTES = FRAME_SAMPLES * 2
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fakes(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(fake_upstreams.app, port=port, log_level="warning", ws_max_size=2**24))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def start_app(port: int, fakes_port: int, workers: int, extra_env: dict) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        **fake_upstreams.app_env("127.0.0.1", fakes_port),
+        "WEB_CONCURRENCY": str(workers),
+        **extra_env,
+    }
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("main:app did not start")
+
+
+def scrape(port: int) -> str:
+    return httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=5).text
+
+
+def metric_values(text: str, name: str, **labels) -> list:
+    values = []
+    for line in text.splitlines():
+        if not line.startswith(name):
+            continue
+        m = re.match(rf"{re.escape(name)}(?:{{(.*)}})? (\S+)$", line)
+        if not m:
+            continue
+        found = dict(re.findall(r'(\w+)="([^"]*)"', m.group(1) or ""))
+        if all(found.get(k) == v for k, v in labels.items()):
+            values.append(float(m.group(2)))
+    return values
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_session(url: str, audio: bytes, turns: int, speed: float, results: dict):
+    session_id = f"load-{uuid.uuid4().hex}"
+    url = f"{url}&session={session_id}"
+    frame_interval = FRAME_SAMPLES / fake_upstreams.SAMPLE_RATE / speed
+    utterance_frames = int(fake_upstreams.latencies.utterance_seconds * fake_upstreams.SAMPLE_RATE / FRAME_SAMPLES) + 1
+    events: asyncio.Queue = asyncio.Queue()
+    offset = 0
+    try:
+        async with websockets.connect(url, max_size=2**24) as ws:
+            async def reader():
+                async for message in ws:
+                    if isinstance(message, bytes):
+                        await events.put(("audio", time.perf_counter()))
+                    else:
+                        data = json.loads(message)
+                        await events.put((data.get("type"), time.perf_counter()))
+
+            reader_task = asyncio.create_task(reader())
+            # Admission: the server answers with "session" once a slot is
+            # free, or "busy" when it sheds the connection.
+            while True:
+                kind, _ = await asyncio.wait_for(events.get(), timeout=30)
+                if kind == "busy":
+                    results["busy_sessions"] += 1
+                    reader_task.cancel()
+                    return
+                if kind == "session":
+                    break
+            for _ in range(turns):
+                for i in range(utterance_frames):
+                    frame = audio[offset:offset + FRAME_BYTES]
+                    if len(frame) < FRAME_BYTES:
+                        offset = 0
+                        frame = audio[:FRAME_BYTES]
+                    offset += FRAME_BYTES
+                    await ws.send(frame)
+                    if i == utterance_frames - 1:
+                        # Speech ends with the last frame, not a frame interval later.
+                        speech_end = time.perf_counter()
+                        break
+                    await asyncio.sleep(frame_interval)
+                final_at = first_audio_at = None
+                while True:
+                    kind, at = await asyncio.wait_for(events.get(), timeout=30)
+                    if kind == "transcription":
+                        final_at = at
+                    elif kind == "audio" and first_audio_at is None:
+                        first_audio_at = at
+                    elif kind in ("audio_end", "busy"):
+                        results["busy_turns"] += kind == "busy"
+                        break
+                if first_audio_at is not None:
+                    results["ttfa_from_speech_end"].append(first_audio_at - speech_end)
+                    if final_at is not None:
+                        results["ttfa_from_final"].append(first_audio_at - final_at)
+                results["turns"] += 1
+            reader_task.cancel()
+        results["completed"] += 1
+        results["sessions"].append(session_id)
+    except Exception as e:
+        results["errors"].append(repr(e))
+
+
+async def drive(args, app_port: int):
+    url = f"ws://127.0.0.1:{app_port}/ws?persona=friendly&audio=binary&format={args.format}&rate={args.rate}"
+    if args.pcm:
+        with open(args.pcm, "rb") as f:
+            audio = f.read()
+    else:
+        audio = os.urandom(FRAME_BYTES * 64)
+    results = {
+        "completed": 0,
+        "turns": 0,
+        "errors": [],
+        "sessions": [],
+        "history_ok": 0,
+        "busy_sessions": 0,
+        "busy_turns": 0,
+        "ttfa_from_final": [],
+        "ttfa_from_speech_end": [],
+    }
+
+    baseline_rss = metric_values(scrape(app_port), "process_resident_memory_bytes")
+    peak_rss = list(baseline_rss)
+
+    async def sample_rss():
+        while True:
+            await asyncio.sleep(0.5)
+            text = await asyncio.to_thread(scrape, app_port)
+            peak_rss.extend(metric_values(text, "process_resident_memory_bytes"))
+
+    sampler = asyncio.create_task(sample_rss())
+    started = time.perf_counter()
+    sessions = []
+    for _ in range(args.sessions):
+        sessions.append(asyncio.create_task(run_session(url, audio, args.turns, args.speed, results)))
+        await asyncio.sleep(args.ramp / max(1, args.sessions))
+    await asyncio.gather(*sessions)
+    wall = time.perf_counter() - started
+    sampler.cancel()
+
+    # Each turn stores a user and an assistant message; read them back through
+    # the REST endpoint, which may be served by a different worker.
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{app_port}") as client:
+        for session_id in results["sessions"]:
+            r = await client.get(f"/agent/chat/history/{session_id}")
+            if r.status_code == 200 and len(r.json()["conversations"]) >= 2 * args.turns:
+                results["history_ok"] += 1
+    return results, wall, baseline_rss, peak_rss
+
+
+def report(args, results, wall, baseline_rss, peak_rss, final_metrics):
+    ms = lambda v: f"{v * 1000:7.1f} ms"  # noqa: E731
+    print(f"sessions: {results['completed']}/{args.sessions} completed, {results['turns']} turns in {wall:.1f}s")
+    print(f"throughput: {results['completed'] / wall:.2f} sessions/s, {results['turns'] / wall:.2f} turns/s")
+    for key, label in (("ttfa_from_final", "final transcript"), ("ttfa_from_speech_end", "end of speech")):
+        v = results[key]
+        print(
+            f"time to first audio from {label:16s}: p50 {ms(percentile(v, .5))}  "
+            f"p95 {ms(percentile(v, .95))}  p99 {ms(percentile(v, .99))}"
+        )
+    lag_p50 = metric_values(final_metrics, "vakya_event_loop_lag_seconds_recent", quantile="0.5")
+    lag_p99 = metric_values(final_metrics, "vakya_event_loop_lag_seconds_recent", quantile="0.99")
+    if lag_p50:
+        print(f"server event-loop lag: p50 {ms(max(lag_p50))}  p99 {ms(max(lag_p99))}")
+    if baseline_rss and peak_rss and args.workers == 1:
+        per_session = (max(peak_rss) - baseline_rss[0]) / max(1, args.sessions)
+        print(f"memory: {max(peak_rss) / 2**20:.1f} MiB peak RSS, ~{per_session / 1024:.1f} KiB per session")
+    print(f"history: {results['history_ok']}/{results['completed']} sessions readable via REST")
+    queued = sum(metric_values(final_metrics, "vakya_admission_total", pool="session", event="queued"))
+    print(
+        f"admission: {results['busy_sessions']} sessions and {results['busy_turns']} turns rejected as busy, "
+        f"{queued:.0f} sessions queued"
+    )
+    if results["errors"]:
+        print(f"errors ({len(results['errors'])}): {results['errors'][:3]}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent /ws clients")
+    parser.add_argument("--turns", type=int, default=3, help="turns per session")
+    parser.add_argument("--speed", type=float, default=1.0, help="audio send rate as a multiple of real time")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds over which sessions are started")
+    parser.add_argument("--pcm", help="raw 16 kHz mono PCM16 file to replay (default: noise)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for main:app")
+    parser.add_argument("--format", default="mp3", help="TTS format to negotiate (mp3 or pcm)")
+    parser.add_argument("--rate", type=int, default=44100, help="TTS sample rate to negotiate")
+    parser.add_argument("--gemini-first-token-ms", type=float, default=350)
+    parser.add_argument("--murf-first-audio-ms", type=float, default=200)
+    parser.add_argument("--http-ms", type=float, default=80)
+    parser.add_argument("--stt-final-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    fake_upstreams.latencies.gemini_first_token = args.gemini_first_token_ms / 1000
+    fake_upstreams.latencies.murf_first_audio = args.murf_first_audio_ms / 1000
+    fake_upstreams.latencies.http = args.http_ms / 1000
+    fake_upstreams.latencies.stt_final = args.stt_final_ms / 1000
+
+    fakes_port, app_port = free_port(), free_port()
+    fakes = start_fakes(fakes_port)
+    db_dir = tempfile.mkdtemp(prefix="vakya-load-")
+    app = start_app(
+        app_port,
+        fakes_port,
+        args.workers,
+        {"SESSION_DB_PATH": os.path.join(db_dir, "sessions.db"), "TTS_CACHE_DIR": os.path.join(db_dir, "tts")},
+    )
+    try:
+        results, wall, baseline_rss, peak_rss = asyncio.run(drive(args, app_port))
+        report(args, results, wall, baseline_rss, peak_rss, scrape(app_port))
+    finally:
+        app.terminate()
+        app.wait(timeout=10)
+        fakes.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
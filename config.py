@@ -9,6 +9,84 @@ ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 MURF_API_KEY = os.getenv("MURF_API_KEY")
 
+# Upstream endpoints. Overridable so the load test can point them at local fakes.
+ASSEMBLYAI_API_HOST = os.getenv("ASSEMBLYAI_API_HOST", "streaming.assemblyai.com")
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+# Configured Gemini clients kept per API key (sessions may bring their own keys).
+GEMINI_MAX_CLIENTS = int(os.getenv("GEMINI_MAX_CLIENTS", "32"))
+GEOCODING_URL = os.getenv("GEOCODING_URL", "https://geocoding-api.open-meteo.com/v1/search")
+FORECAST_URL = os.getenv("FORECAST_URL", "https://api.open-meteo.com/v1/forecast")
+NEWS_API_URL = os.getenv("NEWS_API_URL", "https://newsapi.org/v2")
+
+# uvicorn also reads WEB_CONCURRENCY as its worker count. Workers share no
+# memory, so with more than one the chat history defaults to SQLite.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Chat history storage: "memory" (per process) or "sqlite" (file, survives
+# restarts and is shared by every worker on the host).
+SESSION_STORE = os.getenv("SESSION_STORE", "sqlite" if WEB_CONCURRENCY > 1 else "memory")
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.db")
+SESSION_MAX_TURNS = int(os.getenv("SESSION_MAX_TURNS", "50"))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "3600"))
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+
+# Token budget for the Gemini prompt (history included) and its rolling summary.
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+CONTEXT_SUMMARY_TOKENS = int(os.getenv("CONTEXT_SUMMARY_TOKENS", "300"))
+# Re-summarize only after this many turns have aged out of the recent window.
+CONTEXT_SUMMARY_REFRESH_TURNS = int(os.getenv("CONTEXT_SUMMARY_REFRESH_TURNS", "8"))
+
+# Start skill lookups from partial transcripts before the user finishes speaking.
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "true").lower() == "true"
+
+# Microphone audio is coalesced into packets of at least AUDIO_PACKET_MS before
+# it is sent to AssemblyAI; beyond AUDIO_BUFFER_MS of backlog the oldest is dropped.
+AUDIO_PACKET_MS = int(os.getenv("AUDIO_PACKET_MS", "100"))
+AUDIO_BUFFER_MS = int(os.getenv("AUDIO_BUFFER_MS", "2000"))
+
+# Drop long silences before they reach AssemblyAI. VAD_HANGOVER_MS must exceed
+# AssemblyAI's end-of-turn silence or turns never finalize.
+VAD_ENABLED = os.getenv("VAD_ENABLED", "false").lower() == "true"
+VAD_THRESHOLD_RATIO = float(os.getenv("VAD_THRESHOLD_RATIO", "3.0"))
+VAD_MIN_RMS = float(os.getenv("VAD_MIN_RMS", "300"))
+VAD_PREROLL_MS = int(os.getenv("VAD_PREROLL_MS", "300"))
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "2500"))
+
+# Synthesized audio for fixed replies (jokes, fallbacks, error strings).
+# An empty TTS_CACHE_DIR keeps the cache in memory only.
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "32"))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")
+TTS_CACHE_PREWARM = os.getenv("TTS_CACHE_PREWARM", "true").lower() == "true"
+
+# Reuse reply text for repeated queries. TTLs are seconds per intent ("llm" is
+# any non-skill answer); 0 disables caching for that intent.
+RESPONSE_CACHE_TTLS = {
+    intent.strip(): float(ttl)
+    for intent, ttl in (
+        item.split("=")
+        for item in os.getenv("RESPONSE_CACHE_TTLS", "weather=600,news=300,joke=0,llm=1800").split(",")
+        if item.strip()
+    )
+}
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.8"))
+
+# Offline batch transcription/synthesis: upstream calls in flight per batch
+# type, attempts per item, and the largest accepted batch.
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_ATTEMPTS = int(os.getenv("BATCH_MAX_ATTEMPTS", "3"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+
+# Admission control, per worker: concurrent /ws sessions and in-flight reply
+# turns (each holds a Gemini stream and a Murf socket). Callers beyond the
+# limit wait in a short queue, then get a "busy" message. 0 disables a limit.
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "64"))
+SESSION_QUEUE = int(os.getenv("SESSION_QUEUE", "16"))
+SESSION_QUEUE_TIMEOUT = float(os.getenv("SESSION_QUEUE_TIMEOUT", "5"))
+MAX_INFLIGHT_TURNS = int(os.getenv("MAX_INFLIGHT_TURNS", "32"))
+TURN_QUEUE = int(os.getenv("TURN_QUEUE", "32"))
+TURN_QUEUE_TIMEOUT = float(os.getenv("TURN_QUEUE_TIMEOUT", "3"))
+
 
 if not ASSEMBLYAI_API_KEY:
     logging.warning("ASSEMBLYAI_API_KEY not found in .env file. Please create one.")
@@ -1,34 +1,48 @@
 import os
-from dotenv import load_dotenv
 import logging
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, File, Request, UploadFile, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path as PathLib
 import json
 import asyncio
 import config
-from typing import Type, List, Dict
-import websockets
-from datetime import datetime
+from typing import List, Type
+import base64
+import hashlib
+import importlib
+import sys
 import re
-import requests 
 import random
 import string
-import assemblyai as aai
-import pycountry
-from assemblyai.streaming.v3 import (
-    BeginEvent,
-    StreamingClient,
-    StreamingClientOptions,
-    StreamingError,
-    StreamingEvents,
-    StreamingParameters,
-    TerminationEvent,
-    TurnEvent,
-)
-import google.generativeai as genai
+import time
+import uuid
 from pydantic import BaseModel
+from services.admission import AdmissionController
+from services.audio_ingest import AudioIngestor
+from services.audio_frames import pack_audio_bytes
+from services.batch import BatchRunner
+from services.cache import caches, forecast_cache, geocode_cache, headlines_cache
+from services.context_window import ContextWindow
+from services.countries import extract_country_code
+from services.http_client import http_client
+from services.gemini_clients import GeminiClientRegistry
+from services.intents import Intent, intent_router
+from services.llm_stream import stream_gemini
+from services.metrics import StartupTimer, TurnTrace, metrics, monitor_event_loop_lag
+from services.murf_pool import murf_pool
+from services.response_cache import ResponseCache
+from services.segmenter import SentenceSegmenter
+from services.session_store import create_session_store
+from services.speculation import SkillSpeculator
+from services.tts_cache import SpeechAudioCache
+from services.tts_formats import AudioFramer, TtsOutput, negotiate_output
+from services.turns import TurnController
+
+# Upstream SDKs (AssemblyAI, Gemini, Murf, NumPy for VAD) are imported on first
+# use and warmed in the background once the server is up, so the port binds fast.
+startup = StartupTimer()
 
 # ------------------------------------------------------------------
 # Logging & App setup
@@ -39,41 +53,48 @@ BASE_DIR = PathLib(__file__).resolve().parent
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
-# ------------------------------------------------------------------
-# Load .env
-# ------------------------------------------------------------------
-load_dotenv()
-
 # ------------------------------------------------------------------
 # Gemini Model Setup
 # ------------------------------------------------------------------
-if config.GEMINI_API_KEY:
-    genai.configure(api_key=config.GEMINI_API_KEY)
-    gemini_model = genai.GenerativeModel("gemini-1.5-flash")
-else:
-    gemini_model = None
+gemini_clients = GeminiClientRegistry(
+    max_clients=config.GEMINI_MAX_CLIENTS, endpoint=config.GEMINI_API_ENDPOINT
+)
+if not config.GEMINI_API_KEY:
     logging.warning("Gemini model not initialized. GEMINI_API_KEY is missing.")
 
 # ------------------------------------------------------------------
 # Weather Skill (Current + 3 Day Forecast)
 # ------------------------------------------------------------------
-def get_weather(city: str):
+async def get_weather(city: str):
     """Fetch current weather and 3-day forecast for a city using Open-Meteo API."""
     try:
         city = city.strip().strip(string.punctuation).title()
-        geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={city}&count=1"
-        geo_res = requests.get(geo_url).json()
+        geo_res = await geocode_cache.get_or_fetch(
+            city.lower(),
+            lambda: http_client.get_json(
+                config.GEOCODING_URL,
+                params={"name": city, "count": 1},
+            ),
+        )
         if "results" not in geo_res:
             return f"Sorry, I couldn’t find weather for {city}."
 
         lat, lon = geo_res["results"][0]["latitude"], geo_res["results"][0]["longitude"]
 
-        weather_url = (
-            f"https://api.open-meteo.com/v1/forecast"
-            f"?latitude={lat}&longitude={lon}&current_weather=true"
-            f"&daily=temperature_2m_max,temperature_2m_min,precipitation_sum&forecast_days=3&timezone=auto"
+        weather_res = await forecast_cache.get_or_fetch(
+            (round(lat, 2), round(lon, 2)),
+            lambda: http_client.get_json(
+                config.FORECAST_URL,
+                params={
+                    "latitude": lat,
+                    "longitude": lon,
+                    "current_weather": "true",
+                    "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum",
+                    "forecast_days": 3,
+                    "timezone": "auto",
+                },
+            ),
         )
-        weather_res = requests.get(weather_url).json()
 
         current = weather_res.get("current_weather", {})
         temp, wind = current.get("temperature"), current.get("windspeed")
@@ -100,26 +121,23 @@ def get_weather(city: str):
 # ------------------------------------------------------------------
 # Intent & City Extraction
 # ------------------------------------------------------------------
-def is_weather_intent(text: str) -> bool:
-    return bool(
-        re.search(r"\b(weather|forecast|temperature)\b", text, re.IGNORECASE)
-    ) or bool(re.match(r"^\s*(in|at)\s+\w+", text, re.IGNORECASE))
+WEATHER_KEYWORDS = ["weather", "forecast", "temperature"]
+CITY_SUFFIX_RE = re.compile(r"\b(?:in|at)\s+([a-zA-Z .'-]+)$", re.IGNORECASE)
+CITY_FILLER_RE = re.compile(
+    r"\b(weather|forecast|temperature|temp|what's|whats|the|please|tell me|about)\b",
+    re.IGNORECASE,
+)
 
 
 def extract_city(text: str) -> str:
     text = text.strip()
     lowered = text.lower()
 
-    m = re.search(r"\b(?:in|at)\s+([a-zA-Z .'-]+)$", lowered, re.IGNORECASE)
+    m = CITY_SUFFIX_RE.search(lowered)
     if m:
         return m.group(1).strip().title()
 
-    cleaned = re.sub(
-        r"\b(weather|forecast|temperature|temp|what's|whats|the|please|tell me|about)\b",
-        "",
-        lowered,
-        flags=re.IGNORECASE,
-    ).strip()
+    cleaned = CITY_FILLER_RE.sub("", lowered).strip()
 
     tokens = cleaned.split()
     if tokens:
@@ -129,47 +147,43 @@ def extract_city(text: str) -> str:
 # ------------------------------------------------------------------
 # News & Jokes Skills
 # ------------------------------------------------------------------
-def extract_country_code(user_message: str) -> str:
-    """
-    Detect a country name in the user's message and return its ISO 3166-1 alpha-2 code.
-    Example: "India" -> "in", "United States" -> "us"
-    """
-    for country in pycountry.countries:
-        if country.name.lower() in user_message.lower():
-            return country.alpha_2.lower()
-        if hasattr(country, "official_name") and country.official_name.lower() in user_message.lower():
-            return country.alpha_2.lower()
-    # Special cases / abbreviations
-    common_aliases = {"usa": "us", "uk": "gb", "uae": "ae"}
-    for alias, code in common_aliases.items():
-        if alias in user_message.lower():
-            return code
-    return None
-
-def is_news_intent(text: str) -> bool:
-    return any(word in text.lower() for word in ["news", "headlines", "latest updates"])
-
-
-def get_news(user_message: str = "", default_country: str = "us"):
+NEWS_KEYWORDS = ["news", "headlines", "latest updates"]
+NEWS_KEY_MISSING = "News API key is missing. Please set NEWS_API_KEY in your .env."
+
+
+async def fetch_headlines(endpoint: str, query: dict, api_key: str) -> dict:
+    """Cached NewsAPI lookup. Error payloads are raised so they are never cached."""
+
+    async def fetch():
+        data = await http_client.get_json(
+            f"{config.NEWS_API_URL}/{endpoint}",
+            params={**query, "pageSize": 3, "apiKey": api_key},
+        )
+        if data.get("status") == "error":
+            raise RuntimeError(data.get("message", "NewsAPI error"))
+        return data
+
+    key = (endpoint, tuple(sorted(query.items())))
+    return await headlines_cache.get_or_fetch(key, fetch)
+
+
+async def get_news(user_message: str = "", default_country: str = "us", country_code: str = None):
     """Fetch top 3 headlines dynamically. Falls back to keyword search if country unsupported."""
     try:
         api_key = os.getenv("NEWS_API_KEY")
         if not api_key:
-            return "News API key is missing. Please set NEWS_API_KEY in your .env."
+            return NEWS_KEY_MISSING
 
-        # Extract country
-        country_code = extract_country_code(user_message)
+        # Extract country unless the intent router already did
+        if country_code is None:
+            country_code = extract_country_code(user_message)
 
         if country_code:
-            url = f"https://newsapi.org/v2/top-headlines?country={country_code}&pageSize=3&apiKey={api_key}"
-            resp = requests.get(url, timeout=10)
-            data = resp.json()
+            data = await fetch_headlines("top-headlines", {"country": country_code}, api_key)
 
             # ✅ If no results (unsupported country), fallback to keyword search
             if not data.get("articles"):
-                url = f"https://newsapi.org/v2/everything?q={country_code.upper()}&pageSize=3&apiKey={api_key}"
-                resp = requests.get(url, timeout=10)
-                data = resp.json()
+                data = await fetch_headlines("everything", {"q": country_code.upper()}, api_key)
 
             if "articles" in data and data["articles"]:
                 headlines = [f"{i+1}. {a['title']}" for i, a in enumerate(data["articles"][:3])]
@@ -178,9 +192,7 @@ def get_news(user_message: str = "", default_country: str = "us"):
                 return f"I couldn’t fetch the latest news for {country_code.upper()} right now."
 
         # Default (no country found)
-        url = f"https://newsapi.org/v2/top-headlines?country={default_country}&pageSize=3&apiKey={api_key}"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
+        data = await fetch_headlines("top-headlines", {"country": default_country}, api_key)
         if "articles" in data and data["articles"]:
             headlines = [f"{i+1}. {a['title']}" for i, a in enumerate(data["articles"][:3])]
             return f"Here are the top 3 headlines for {default_country.upper()}:\n" + "\n".join(headlines)
@@ -191,23 +203,176 @@ def get_news(user_message: str = "", default_country: str = "us"):
         return f"Error fetching news: {e}"
 
 
-def is_joke_intent(text: str) -> bool:
-    return any(word in text.lower() for word in ["joke", "funny", "make me laugh", "laugh"])
+# Keywords match whole words, so inflected forms are listed explicitly.
+JOKE_KEYWORDS = [
+    "joke", "jokes", "funny", "funnier", "funniest", "make me laugh", "laugh", "laughs", "laughing",
+]
+
+
+JOKES = [
+    "Why don't programmers like nature? Because it has too many bugs.",
+    "Why did the computer go to the doctor? Because it caught a virus!",
+    "Why do Java developers wear glasses? Because they don’t see sharp.",
+    "I told my laptop a joke, but it didn’t laugh. It just gave me a byte.",
+]
 
 
 def get_joke():
-    jokes = [
-        "Why don't programmers like nature? Because it has too many bugs.",
-        "Why did the computer go to the doctor? Because it caught a virus!",
-        "Why do Java developers wear glasses? Because they don’t see sharp.",
-        "I told my laptop a joke, but it didn’t laugh. It just gave me a byte.",
-    ]
-    return random.choice(jokes)
+    return random.choice(JOKES)
+
+# ------------------------------------------------------------------
+# Skill Registry
+# ------------------------------------------------------------------
+async def weather_skill(transcript: str, slots: dict) -> str:
+    return await get_weather(slots.get("city") or "Vijayawada")
+
+
+async def news_skill(transcript: str, slots: dict) -> str:
+    return await get_news(transcript, country_code=slots.get("country"))
+
+
+async def joke_skill(transcript: str, slots: dict) -> str:
+    return get_joke()
+
+
+intent_router.register(
+    Intent(
+        name="weather",
+        keywords=WEATHER_KEYWORDS,
+        patterns=[r"^\s*(?:in|at)\s+\w+"],
+        slots={"city": extract_city},
+        handler=weather_skill,
+        priority=0,
+        prefetch=True,
+    )
+)
+intent_router.register(
+    Intent(
+        name="news",
+        keywords=NEWS_KEYWORDS,
+        slots={"country": extract_country_code},
+        handler=news_skill,
+        priority=1,
+        prefetch=True,
+    )
+)
+intent_router.register(Intent(name="joke", keywords=JOKE_KEYWORDS, handler=joke_skill, priority=2))
+startup.mark("skills")
 
 # ------------------------------------------------------------------
 # Chat History
 # ------------------------------------------------------------------
-chat_histories: Dict[str, List[Dict[str, str]]] = {}
+session_store = create_session_store(
+    config.SESSION_STORE,
+    path=config.SESSION_DB_PATH,
+    max_turns=config.SESSION_MAX_TURNS,
+    idle_ttl=config.SESSION_IDLE_TTL,
+    max_sessions=config.SESSION_MAX_SESSIONS,
+)
+if config.WEB_CONCURRENCY > 1 and config.SESSION_STORE == "memory":
+    logging.warning("Running several workers with SESSION_STORE=memory: history is not shared.")
+# Client-chosen session ids (e.g. a UUID kept in localStorage).
+SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def resolve_session_id(requested: str = None) -> str:
+    """Use the client's session id when well-formed, otherwise mint one."""
+    if requested and SESSION_ID_RE.match(requested):
+        return requested
+    return uuid.uuid4().hex
+
+
+context_window = ContextWindow(
+    budget_tokens=config.CONTEXT_TOKEN_BUDGET,
+    summary_tokens=config.CONTEXT_SUMMARY_TOKENS,
+    max_sessions=config.SESSION_MAX_SESSIONS,
+    refresh_turns=config.CONTEXT_SUMMARY_REFRESH_TURNS,
+)
+
+# Skill replies that report a failure; these are never cached.
+SKILL_FAILURE_PREFIXES = (
+    "Sorry, I couldn’t find",
+    "Could not fetch",
+    "I couldn’t fetch",
+    "Error fetching",
+    NEWS_KEY_MISSING,
+)
+
+response_cache = ResponseCache(
+    "responses",
+    ttls=config.RESPONSE_CACHE_TTLS,
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+    similarity=config.RESPONSE_CACHE_SIMILARITY,
+)
+
+
+def skill_cache_query(match) -> str:
+    """Skills answer from their slots, so those are the query to cache on."""
+    return " ".join(f"{k} {v}" for k, v in sorted(match.slots.items()) if v) or match.intent.name
+
+# ------------------------------------------------------------------
+# Synthesized Audio Cache
+# ------------------------------------------------------------------
+# Sessions may ask for another voice, codec and rate (see negotiate_output).
+DEFAULT_TTS_OUTPUT = TtsOutput(voice="en-IN-isha", style="Conversational", fmt="MP3", sample_rate=44100)
+# What static/index.js negotiates by default: 24 kHz PCM, or 24 kHz MP3 on
+# slow links. Pre-warmed alongside DEFAULT_TTS_OUTPUT so browsers hit it.
+PREWARM_TTS_OUTPUTS = [
+    DEFAULT_TTS_OUTPUT,
+    TtsOutput(voice="en-IN-isha", style="Conversational", fmt="PCM", sample_rate=24000),
+    TtsOutput(voice="en-IN-isha", style="Conversational", fmt="MP3", sample_rate=24000),
+]
+FALLBACK_REPLY = "Okay."
+# Replies whose text never changes; their audio is cached and pre-warmed.
+STATIC_REPLIES = {*JOKES, FALLBACK_REPLY, NEWS_KEY_MISSING}
+
+tts_audio_cache = SpeechAudioCache(
+    max_bytes=config.TTS_CACHE_MAX_MB * 2**20, disk_dir=config.TTS_CACHE_DIR or None
+)
+
+
+def tts_cache_key(text: str, output: TtsOutput = DEFAULT_TTS_OUTPUT) -> str:
+    return SpeechAudioCache.key(text, output.voice, output.style, output.fmt, output.sample_rate)
+
+
+async def acquire_tts_context(output: TtsOutput = DEFAULT_TTS_OUTPUT):
+    return await murf_pool.acquire(
+        config.MURF_API_KEY, output.voice, output.style, output.sample_rate, output.fmt
+    )
+
+
+async def prewarm_tts_cache():
+    """Synthesize every static reply not already cached (on disk or in memory),
+    in each output format clients negotiate by default."""
+    warmed = 0
+    jobs = [(output, text) for output in PREWARM_TTS_OUTPUTS for text in sorted(STATIC_REPLIES)]
+    for output, text in jobs:
+        key = tts_cache_key(text, output)
+        if await tts_audio_cache.get(key):
+            continue
+        try:
+            tts_ctx = await acquire_tts_context(output)
+        except Exception as e:
+            logging.warning(f"TTS cache: pre-warm stopped, Murf unavailable: {e}")
+            break
+        try:
+            await tts_ctx.send_text(text, end=True)
+            chunks = []
+            while True:
+                response = await asyncio.wait_for(tts_ctx.recv(), timeout=30.0)
+                if response is None:
+                    break
+                if response.get("audio"):
+                    chunks.append(response["audio"])
+                if response.get("final"):
+                    await tts_audio_cache.put(key, chunks)
+                    warmed += 1
+                    break
+        except Exception as e:
+            logging.warning(f"TTS cache: could not pre-warm '{text}': {e}")
+        finally:
+            tts_ctx.release()
+    logging.info(f"TTS cache: pre-warmed {warmed} of {len(jobs)} static reply/format pairs.")
 
 
 class ChatMessage(BaseModel):
@@ -217,24 +382,114 @@ class ChatMessage(BaseModel):
 
 @app.post("/agent/chat/{session_id}")
 async def add_message(session_id: str, msg: ChatMessage):
-    if session_id not in chat_histories:
-        chat_histories[session_id] = []
-    chat_histories[session_id].append(msg.dict())
+    await session_store.append_async(session_id, msg.role, msg.message)
     return {"status": "ok"}
 
 
 @app.get("/agent/chat/history/{session_id}")
 async def get_history(session_id: str):
-    if session_id not in chat_histories:
+    history = await session_store.history_async(session_id)
+    if history is None:
         raise HTTPException(status_code=404, detail="No history found")
-    return {"conversations": chat_histories[session_id]}
+    return {"conversations": history}
+
+startup.mark("stores_and_caches")
+
+# ------------------------------------------------------------------
+# Batch Transcription & Synthesis
+# ------------------------------------------------------------------
+stt_batch = BatchRunner(
+    "stt", concurrency=config.BATCH_CONCURRENCY, max_attempts=config.BATCH_MAX_ATTEMPTS
+)
+tts_batch = BatchRunner(
+    "tts", concurrency=config.BATCH_CONCURRENCY, max_attempts=config.BATCH_MAX_ATTEMPTS
+)
+_stt = None
+_tts = None
+
+
+def transcribe_blocking(audio: bytes) -> str:
+    global _stt
+    if _stt is None:
+        from services.stt import STT
+
+        _stt = STT()
+    return _stt.transcribe_audio(audio)
+
+
+def synthesize_blocking(job: tuple) -> str:
+    global _tts
+    if _tts is None:
+        from services.tts import TTS
+
+        _tts = TTS()
+    text, voice_id = job
+    return _tts.generate_audio(text, voice_id)
+
+
+class BatchSynthesisRequest(BaseModel):
+    texts: List[str]
+    voice_id: str = "en-IN-Isha"
+
+
+async def ndjson_results(results, labels: List[dict]):
+    """Stream batch results as newline-delimited JSON, then a summary line."""
+    counts = {"ok": 0, "error": 0}
+    async for record in results:
+        counts[record["status"]] += 1
+        yield json.dumps({**labels[record["index"]], **record}) + "\n"
+    yield json.dumps({"type": "summary", "total": len(labels), **counts}) + "\n"
+
+
+def check_batch_size(n: int):
+    if not n:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if n > config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {config.BATCH_MAX_ITEMS} items per batch")
+
+
+@app.post("/batch/transcribe")
+async def batch_transcribe(files: List[UploadFile] = File(...)):
+    check_batch_size(len(files))
+    items, labels = [], []
+    for upload in files:
+        audio = await upload.read()
+        items.append((hashlib.sha256(audio).hexdigest(), audio))
+        labels.append({"filename": upload.filename})
+    return StreamingResponse(
+        ndjson_results(stt_batch.run(items, transcribe_blocking), labels),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/batch/synthesize")
+async def batch_synthesize(request: BatchSynthesisRequest):
+    check_batch_size(len(request.texts))
+    items, labels = [], []
+    for text in request.texts:
+        key = hashlib.sha256(f"{request.voice_id}\x1f{text.strip()}".encode("utf-8")).hexdigest()
+        items.append((key, (text.strip(), request.voice_id)))
+        labels.append({"text": text})
+    return StreamingResponse(
+        ndjson_results(tts_batch.run(items, synthesize_blocking), labels),
+        media_type="application/x-ndjson",
+    )
 
 
 # ------------------------------------------------------------------
 # LLM + Murf Streaming
 # ------------------------------------------------------------------
 async def get_llm_response_stream(
-    transcript: str, client_websocket: WebSocket, persona: str = "friendly"
+    transcript: str,
+    client_websocket: WebSocket,
+    session_id: str,
+    gemini_model,
+    persona: str = "friendly",
+    speculator: SkillSpeculator = None,
+    trace: TurnTrace = None,
+    debug: bool = False,
+    binary_audio: bool = False,
+    tts_output: TtsOutput = DEFAULT_TTS_OUTPUT,
 ):
     if not transcript or not transcript.strip():
         return
@@ -243,58 +498,89 @@ async def get_llm_response_stream(
         return
 
     logging.info(f"Sending to Gemini: '{transcript}' with persona: {persona}")
-
-    murf_uri = (
-        f"wss://api.murf.ai/v1/speech/stream-input?api-key={config.MURF_API_KEY}"
-        f"&sample_rate=44100&channel_type=MONO&format=MP3"
-    )
+    trace = trace or TurnTrace()
 
     try:
-        async with websockets.connect(murf_uri) as tts_ws:
-            voice_id = "en-IN-Isha"
-            logging.info(f"Connected to Murf AI, using voice: {voice_id}")
-            context_id = f"voice-agent-context-{datetime.now().isoformat()}"
-
-            await tts_ws.send(
-                json.dumps(
-                    {
-                        "voice_config": {"voiceId": voice_id, "style": "Conversational"},
-                        "context_id": context_id,
-                    }
-                )
-            )
+        # Murf is only touched once there is text to synthesize, so a reply
+        # played from the audio cache never waits on (or fails with) Murf.
+        tts_ctx = None
+        receiver_task = None
+        seq = 0
+        framer = AudioFramer(tts_output)
+        # Cache key to record this turn's Murf audio under, for static replies.
+        record_key = None
+        try:
+            async def finish_audio():
+                trace.mark("audio_end")
+                await client_websocket.send_text(json.dumps({"type": "audio_end"}))
+                if debug:
+                    await client_websocket.send_text(
+                        json.dumps({"type": "turn_timing", "timings_ms": trace.as_dict()})
+                    )
+
+            async def forward_audio(audio_b64: str):
+                nonlocal seq
+                # One Murf chunk may become several PCM frames, or none yet.
+                frames = framer.frames(base64.b64decode(audio_b64)) if binary_audio else [audio_b64]
+                for frame in frames:
+                    if seq == 0:
+                        await client_websocket.send_text(json.dumps({"type": "audio_start"}))
+                        trace.mark("tts_first_audio")
+                        logging.info("Streaming first audio chunk.")
+                    if binary_audio:
+                        await client_websocket.send_bytes(pack_audio_bytes(seq, tts_output.fmt, frame))
+                    else:
+                        await client_websocket.send_text(json.dumps({"type": "audio", "data": frame}))
+                    seq += 1
 
             async def receive_and_forward_audio():
-                first_audio_chunk_received = False
+                recorded = []
                 while True:
                     try:
-                        resp_raw = await tts_ws.recv()
-                        response = json.loads(resp_raw)
+                        response = await tts_ctx.recv()
+                        if response is None:
+                            await finish_audio()
+                            break
                         if "audio" in response and response["audio"]:
-                            if not first_audio_chunk_received:
-                                await client_websocket.send_text(
-                                    json.dumps({"type": "audio_start"})
-                                )
-                                first_audio_chunk_received = True
-                                logging.info("Streaming first audio chunk.")
-                            await client_websocket.send_text(
-                                json.dumps({"type": "audio", "data": response["audio"]})
-                            )
+                            await forward_audio(response["audio"])
+                            recorded.append(response["audio"])
                         if response.get("final"):
-                            await client_websocket.send_text(
-                                json.dumps({"type": "audio_end"})
-                            )
+                            if record_key:
+                                await tts_audio_cache.put(record_key, recorded)
+                            await finish_audio()
                             break
-                    except websockets.ConnectionClosed:
-                        await client_websocket.send_text(
-                            json.dumps({"type": "audio_end"})
-                        )
-                        break
                     except Exception as e:
                         logging.error(f"Murf error: {e}")
                         break
 
-            receiver_task = asyncio.create_task(receive_and_forward_audio())
+            async def send_to_tts(text: str, end: bool = False):
+                nonlocal receiver_task, tts_ctx
+                if tts_ctx is None:
+                    with trace.span("tts_connect"):
+                        tts_ctx = await acquire_tts_context(tts_output)
+                    logging.info(f"Using pooled Murf socket, context: {tts_ctx.context_id}")
+                # Murf replies queue on the context, so the reader can start lazily.
+                if receiver_task is None:
+                    receiver_task = asyncio.create_task(receive_and_forward_audio())
+                await tts_ctx.send_text(text, end=end)
+
+            async def speak_reply(text: str):
+                """Speak a complete reply, from cached audio when we have it."""
+                nonlocal record_key
+                trace.mark("first_sentence_to_tts")
+                # Only a reply spoken in one piece can be replayed or recorded.
+                if receiver_task is None:
+                    key = tts_cache_key(text, tts_output)
+                    cached = await tts_audio_cache.get(key)
+                    if cached:
+                        logging.info(f"Playing cached audio for: {text}")
+                        for audio_b64 in cached:
+                            await forward_audio(audio_b64)
+                        await finish_audio()
+                        return
+                    if text in STATIC_REPLIES:
+                        record_key = key
+                await send_to_tts(text, end=True)
 
             try:
                 persona_instruction = {
@@ -309,112 +595,208 @@ async def get_llm_response_stream(
                 }.get(persona, "a friendly and conversational assistant.")
 
                 final_spoken_text = None
-                if is_weather_intent(transcript):
-                    city = extract_city(transcript)
-                    weather_info = get_weather(city or "Vijayawada")
-                    final_spoken_text = weather_info
-                    await client_websocket.send_text(
-                        json.dumps({"type": "llm_chunk", "data": weather_info})
-                    )
-                # News intent
-                if final_spoken_text is None and is_news_intent(transcript):
-                    news_report = get_news(transcript)  # pass transcript for dynamic country detection
-                    final_spoken_text = news_report
+                history = await session_store.history_async(session_id) or []
+                # Gemini sees the history, so its replies are only reused for a
+                # session's opening question (the history holds just this turn).
+                in_conversation = len(history) > 1
+                with trace.span("route"):
+                    match = intent_router.best(transcript)
+                    intent_name = match.intent.name if match else "llm"
+                    cache_query = skill_cache_query(match) if match else transcript
+                    cached_reply = response_cache.get(persona, intent_name, cache_query, in_conversation)
+                # With a cached reply any prefetch is redundant; take(None) discards it.
+                prefetched = speculator.take(None if cached_reply else match) if speculator else None
+                if cached_reply is not None:
+                    logging.info(f"Response cache hit for '{intent_name}': '{transcript}'")
+                    trace.mark("response_cache_hit")
+                    final_spoken_text = cached_reply
+                elif match and prefetched:
+                    logging.info(f"Using speculative '{match.intent.name}' result.")
+                    with trace.span("skill"):
+                        final_spoken_text = await asyncio.wrap_future(prefetched)
+                elif match:
+                    logging.info(f"Routed to skill '{match.intent.name}' with slots {match.slots}")
+                    with trace.span("skill"):
+                        final_spoken_text = await match.intent.handler(transcript, match.slots)
+                if (
+                    match
+                    and cached_reply is None
+                    and final_spoken_text
+                    and not final_spoken_text.startswith(SKILL_FAILURE_PREFIXES)
+                ):
+                    response_cache.put(persona, intent_name, cache_query, final_spoken_text)
+                if final_spoken_text is not None:
                     await client_websocket.send_text(
-                        json.dumps({"type": "llm_chunk", "data": news_report})
+                        json.dumps({"type": "llm_chunk", "data": final_spoken_text})
                     )
 
-                # Joke intent
-                if final_spoken_text is None and is_joke_intent(transcript):
-                    joke = get_joke()
-                    final_spoken_text = joke
-                    await client_websocket.send_text(
-                        json.dumps({"type": "llm_chunk", "data": joke})
-                    )
-                
-                
-                
                 if final_spoken_text is None:
-                    prompt = (
-                        f"You are {persona_instruction}\n"
-                        f"The user just said: \"{transcript}\"\n"
-                        f"Respond concisely in character. Do not use markdown."
+                    prompt, prompt_tokens = context_window.build_prompt(
+                        session_id,
+                        history,
+                        persona_instruction,
+                        transcript,
+                        gemini_model,
                     )
+                    logging.info(f"Gemini prompt: ~{prompt_tokens} tokens for session {session_id}")
 
-                    def generate_sync():
-                        return gemini_model.generate_content(prompt, stream=True)
-
-                    loop = asyncio.get_running_loop()
-                    gemini_response_stream = await loop.run_in_executor(
-                        None, generate_sync
-                    )
-
-                    sentence_buffer = ""
-                    assistant_response_accum = ""
-                    for chunk in gemini_response_stream:
-                        if chunk.text:
+                    segmenter = SentenceSegmenter()
+                    response_parts = []
+                    gemini_chunks = stream_gemini(gemini_model, prompt)
+                    try:
+                        async for chunk_text in gemini_chunks:
+                            trace.mark("llm_first_token")
                             await client_websocket.send_text(
-                                json.dumps({"type": "llm_chunk", "data": chunk.text})
+                                json.dumps({"type": "llm_chunk", "data": chunk_text})
                             )
-                            sentence_buffer += chunk.text
-                            assistant_response_accum += chunk.text
-
-                        sentences = re.split(r"(?<=[.?!])\s+", sentence_buffer)
-                        if len(sentences) > 1:
-                            for sentence in sentences[:-1]:
-                                s = sentence.strip()
-                                if s:
-                                    await tts_ws.send(
-                                        json.dumps(
-                                            {"text": s, "end": False, "context_id": context_id}
-                                        )
-                                    )
-                            sentence_buffer = sentences[-1]
-
-                    final_text = (
-                        sentence_buffer.strip()
-                        or assistant_response_accum.strip()
-                        or "Okay."
-                    )
-                    logging.info(f"Sending to Murf (final): {final_text}")
-                    await tts_ws.send(
-                        json.dumps({"text": final_text, "end": True, "context_id": context_id})
-                    )
-
-                    session_id = str(client_websocket.client[1])
-                    chat_histories.setdefault(session_id, []).append(
-                        {"role": "assistant", "message": (assistant_response_accum.strip() or final_text)}
-                    )
+                            response_parts.append(chunk_text)
+                            for segment in segmenter.feed(chunk_text):
+                                trace.mark("first_sentence_to_tts")
+                                await send_to_tts(segment)
+                    finally:
+                        await gemini_chunks.aclose()
+
+                    assistant_response = "".join(response_parts).strip()
+                    final_text = segmenter.flush()
+                    if final_text or receiver_task is None:
+                        final_text = final_text or assistant_response or FALLBACK_REPLY
+                        logging.info(f"Sending to Murf (final): {final_text}")
+                        await speak_reply(final_text)
+                    else:
+                        # Every segment is already with Murf; just close the context.
+                        await send_to_tts("", end=True)
+
+                    await session_store.append_async(session_id, "assistant", assistant_response or final_text)
+                    response_cache.put(persona, "llm", transcript, assistant_response, in_conversation)
                 else:
-                    logging.info(f"Sending WEATHER reply to Murf: {final_spoken_text}")
-                    await tts_ws.send(
-                        json.dumps(
-                            {"text": final_spoken_text, "end": True, "context_id": context_id}
-                        )
-                    )
-                    session_id = str(client_websocket.client[1])
-                    chat_histories.setdefault(session_id, []).append(
-                        {"role": "assistant", "message": final_spoken_text}
-                    )
+                    logging.info(f"Sending skill reply to Murf: {final_spoken_text}")
+                    await speak_reply(final_spoken_text)
+                    await session_store.append_async(session_id, "assistant", final_spoken_text)
 
-                await asyncio.wait_for(receiver_task, timeout=60.0)
+                if receiver_task is not None:
+                    await asyncio.wait_for(receiver_task, timeout=60.0)
 
             finally:
-                if not receiver_task.done():
-                    try:
-                        await receiver_task
-                    except asyncio.CancelledError:
-                        logging.warning("Receiver task cancelled.")
+                # Only reached with the receiver still running on cancellation
+                # or error: stop forwarding and have Murf drop pending audio.
+                if receiver_task is not None and not receiver_task.done():
+                    receiver_task.cancel()
+                    await tts_ctx.clear()
+        finally:
+            if tts_ctx is not None:
+                tts_ctx.release()
     except asyncio.CancelledError:
         logging.info("LLM/TTS task was cancelled.")
-        await client_websocket.send_text(json.dumps({"type": "audio_interrupt"}))
+        raise
     except Exception as e:
         logging.error(f"Error in LLM/TTS streaming: {e}", exc_info=True)
 
 
+# ------------------------------------------------------------------
+# Admission Control
+# ------------------------------------------------------------------
+session_admission = AdmissionController(
+    "session", config.MAX_SESSIONS, config.SESSION_QUEUE, config.SESSION_QUEUE_TIMEOUT
+)
+turn_admission = AdmissionController(
+    "turn", config.MAX_INFLIGHT_TURNS, config.TURN_QUEUE, config.TURN_QUEUE_TIMEOUT
+)
+
+
+def busy_message(scope: str, controller: AdmissionController) -> dict:
+    return {
+        "type": "busy",
+        "scope": scope,
+        "retry_after": controller.timeout,
+        "message": "The assistant is busy right now. Please try again in a moment.",
+    }
+
+
+async def run_admitted_turn(turn, client_websocket: WebSocket):
+    """Run one reply turn once a turn slot is free, or tell the client we're busy."""
+    try:
+        admitted = await turn_admission.acquire()
+    except BaseException:
+        turn.close()
+        raise
+    if not admitted:
+        turn.close()
+        logging.warning("Turn rejected: too many replies in flight.")
+        await send_client_message(client_websocket, busy_message("turn", turn_admission))
+        return
+    try:
+        await turn
+    finally:
+        turn_admission.release()
+
+
 # ------------------------------------------------------------------
 # Routes & WebSocket
 # ------------------------------------------------------------------
+def upstream_gauges():
+    for name, cache in caches.items():
+        for stat, value in cache.stats.items():
+            yield "vakya_cache_events_total", {"cache": name, "event": stat}, value
+        yield "vakya_cache_entries", {"cache": name}, len(cache)
+    yield "vakya_murf_pool_sockets", {}, len(murf_pool.connections)
+    yield "vakya_gemini_clients", {}, len(gemini_clients)
+    for runner in (stt_batch, tts_batch):
+        for stat, value in runner.stats.items():
+            yield "vakya_batch_events_total", {"batch": runner.name, "event": stat}, value
+    for stat, value in tts_audio_cache.stats.items():
+        yield "vakya_tts_cache_events_total", {"event": stat}, value
+    yield "vakya_tts_cache_entries", {}, len(tts_audio_cache)
+    yield "vakya_tts_cache_bytes", {}, tts_audio_cache.bytes
+
+
+metrics.register_collector(upstream_gauges)
+metrics.register_collector(startup.gauges)
+
+
+async def load_module(name: str):
+    """Import a module off the event loop; free once it is loaded."""
+    module = sys.modules.get(name)
+    if module is None:
+        module = await asyncio.to_thread(importlib.import_module, name)
+    return module
+
+
+async def warm_upstream_sdks():
+    """Load the SDKs the first session needs, after the port is already serving."""
+    modules = ["assemblyai.streaming.v3", "google.generativeai"]
+    if config.VAD_ENABLED:
+        modules.append("services.vad")
+    for name in modules:
+        await load_module(name)
+    if config.GEMINI_API_KEY:
+        await asyncio.to_thread(gemini_clients.get, config.GEMINI_API_KEY)
+    startup.mark("sdk_warmup")
+    logging.info(f"Upstream SDKs ready in {startup.phases['sdk_warmup'] * 1000:.0f} ms.")
+
+
+@app.on_event("startup")
+async def start_background_monitors():
+    startup.mark("startup_hooks")
+    logging.info(f"Cold start: {startup.summary()}")
+    app.state.lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    app.state.sdk_warmup = asyncio.create_task(warm_upstream_sdks())
+    if config.TTS_CACHE_PREWARM and config.MURF_API_KEY:
+        app.state.tts_prewarm = asyncio.create_task(prewarm_tts_cache())
+
+
+@app.on_event("shutdown")
+async def close_upstream_clients():
+    await murf_pool.close()
+    await http_client.close()
+    stt_batch.executor.shutdown(wait=False, cancel_futures=True)
+    tts_batch.executor.shutdown(wait=False, cancel_futures=True)
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -431,13 +813,49 @@ async def send_client_message(ws: WebSocket, message: dict):
 async def websocket_audio_streaming(websocket: WebSocket):
     await websocket.accept()
     logging.info("WebSocket connection accepted.")
+    if session_admission.would_wait():
+        await send_client_message(websocket, {"type": "status", "message": "Waiting for a free slot..."})
+    if not await session_admission.acquire():
+        logging.warning("Session rejected: worker is at its session limit.")
+        await send_client_message(websocket, busy_message("session", session_admission))
+        if websocket.client_state.name != "DISCONNECTED":
+            # 1013: "try again later".
+            await websocket.close(code=1013)
+        return
+    try:
+        await serve_voice_session(websocket)
+    finally:
+        session_admission.release()
+
+
+async def serve_voice_session(websocket: WebSocket):
     main_loop = asyncio.get_running_loop()
     persona = websocket.query_params.get("persona", "friendly")
     logging.info(f"Persona selected: {persona}")
     
     params = websocket.query_params
-    llm_task = None
+    # A stable id from the client lets any worker find this conversation's
+    # history, and lets a proxy route the session consistently.
+    session_id = resolve_session_id(params.get("session"))
+    # Clients that can parse binary frames get raw audio instead of base64 JSON.
+    binary_audio = params.get("audio") == "binary"
+    tts_output = negotiate_output(
+        DEFAULT_TTS_OUTPUT,
+        voice=params.get("voice"),
+        fmt=params.get("format"),
+        sample_rate=params.get("rate"),
+        binary_audio=binary_audio,
+    )
+    logging.info(f"TTS output: {tts_output.describe()}")
+    await send_client_message(
+        websocket, {"type": "session", "id": session_id, "audio": tts_output.describe()}
+    )
+    turns = TurnController(
+        main_loop, lambda: send_client_message(websocket, {"type": "audio_interrupt"})
+    )
     last_processed_transcript = ""
+    end_of_speech_at = None
+    debug_timing = params.get("debug") == "1"
 
     gemini_key = params.get("gemini") or config.GEMINI_API_KEY
     murf_key = params.get("murf") or config.MURF_API_KEY
@@ -445,8 +863,7 @@ async def websocket_audio_streaming(websocket: WebSocket):
     news_key = params.get("news") or os.getenv("NEWS_API_KEY")
 
     if gemini_key:
-        genai.configure(api_key=gemini_key)
-        gemini_model = genai.GenerativeModel("gemini-1.5-flash")
+        gemini_model = await asyncio.to_thread(gemini_clients.get, gemini_key)
     else:
         gemini_model = None
         logging.warning("No Gemini API key provided.")
@@ -457,11 +874,41 @@ async def websocket_audio_streaming(websocket: WebSocket):
         return
 
 
-    client = StreamingClient(StreamingClientOptions(api_key=assembly_key))
+    await load_module("assemblyai.streaming.v3")
+    from assemblyai.streaming.v3 import (
+        StreamingClient,
+        StreamingClientOptions,
+        StreamingEvents,
+        StreamingParameters,
+        TurnEvent,
+    )
+
+    client = StreamingClient(
+        StreamingClientOptions(api_key=assembly_key, api_host=config.ASSEMBLYAI_API_HOST)
+    )
+    speculator = SkillSpeculator(intent_router, main_loop) if config.SPECULATIVE_PREFETCH else None
+    ingest = None
+    vad = None
+    if config.VAD_ENABLED:
+        vad_module = await load_module("services.vad")
+        vad = vad_module.VoiceActivityGate(
+            threshold_ratio=config.VAD_THRESHOLD_RATIO,
+            min_rms=config.VAD_MIN_RMS,
+            preroll_ms=config.VAD_PREROLL_MS,
+            hangover_ms=config.VAD_HANGOVER_MS,
+        )
 
     def on_turn(self: Type[StreamingClient], event: TurnEvent):
-        nonlocal last_processed_transcript, llm_task
+        nonlocal last_processed_transcript, end_of_speech_at
         transcript_text = (event.transcript or "").strip()
+        if event.end_of_turn and end_of_speech_at is None:
+            end_of_speech_at = time.perf_counter()
+        if speculator and transcript_text and not (event.end_of_turn and event.turn_is_formatted):
+            speculator.observe(transcript_text)
+        if transcript_text and not event.end_of_turn and turns.busy:
+            # Barge-in: the user started talking over the reply; stop it now
+            # rather than at the end of their turn.
+            turns.cancel()
         if (
             event.end_of_turn
             and event.turn_is_formatted
@@ -469,28 +916,37 @@ async def websocket_audio_streaming(websocket: WebSocket):
             and transcript_text != last_processed_transcript
         ):
             last_processed_transcript = transcript_text
-            if llm_task and not llm_task.done():
-                logging.warning("User interrupted. Cancelling previous response.")
-                llm_task.cancel()
-                asyncio.run_coroutine_threadsafe(
-                    send_client_message(websocket, {"type": "audio_interrupt"}), main_loop
-                )
-
+            trace = TurnTrace(started_at=end_of_speech_at)
+            end_of_speech_at = None
+            trace.mark("assemblyai_final")
             logging.info(f"Final turn: '{transcript_text}'")
-            session_id = str(websocket.client[1])
-            chat_histories.setdefault(session_id, []).append(
-                {"role": "user", "message": transcript_text}
-            )
+            # Runs on the AssemblyAI callback thread, so the blocking call is fine.
+            session_store.append(session_id, "user", transcript_text)
             asyncio.run_coroutine_threadsafe(
                 send_client_message(
                     websocket, {"type": "transcription", "text": transcript_text, "end_of_turn": True}
                 ),
                 main_loop,
             )
-            llm_task = asyncio.run_coroutine_threadsafe(
-                get_llm_response_stream(transcript_text, websocket, persona), main_loop
+            turns.start(
+                run_admitted_turn(
+                    get_llm_response_stream(
+                        transcript_text,
+                        websocket,
+                        session_id,
+                        gemini_model,
+                        persona,
+                        speculator,
+                        trace,
+                        debug_timing,
+                        binary_audio,
+                        tts_output,
+                    ),
+                    websocket,
+                )
             )
         elif transcript_text and transcript_text == last_processed_transcript:
+            end_of_speech_at = None
             logging.warning(f"Duplicate turn ignored: '{transcript_text}'")
 
     client.on(StreamingEvents.Begin, lambda self, e: logging.info("Transcription started."))
@@ -499,7 +955,10 @@ async def websocket_audio_streaming(websocket: WebSocket):
     client.on(StreamingEvents.Error, lambda self, err: logging.error(f"AssemblyAI error: {err}"))
 
     try:
-        client.connect(StreamingParameters(sample_rate=16000, format_turns=True))
+        await asyncio.to_thread(client.connect, StreamingParameters(sample_rate=16000, format_turns=True))
+        ingest = AudioIngestor(
+            client.stream, packet_ms=config.AUDIO_PACKET_MS, buffer_ms=config.AUDIO_BUFFER_MS
+        )
         await send_client_message(websocket, {"type": "status", "message": "Connected to transcription service."})
 
         while True:
@@ -512,21 +971,31 @@ async def websocket_audio_streaming(websocket: WebSocket):
                 except (json.JSONDecodeError, TypeError):
                     pass
             elif "bytes" in message:
-                if message["bytes"]:
-                    client.stream(message["bytes"])
+                audio = message["bytes"]
+                if audio and vad is not None:
+                    audio = vad.process(audio)
+                if audio:
+                    ingest.push(audio)
     except (WebSocketDisconnect, RuntimeError) as e:
         logging.info(f"Client disconnected: {e}")
     except Exception as e:
         logging.error(f"WebSocket error: {e}", exc_info=True)
     finally:
-        if llm_task and not llm_task.done():
-            llm_task.cancel()
+        await turns.close()
+        if speculator:
+            speculator.reset()
         logging.info("Cleaning up connection resources.")
-        client.disconnect()
+        if ingest is not None:
+            await asyncio.to_thread(ingest.close)
+        # disconnect() joins the SDK's reader/writer threads; never on the loop.
+        await asyncio.to_thread(client.disconnect)
         if websocket.client_state.name != "DISCONNECTED":
             await websocket.close()
 
 
+startup.mark("routes")
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, List
+
+from services.metrics import metrics, stage_seconds
+
+
+class AdmissionController:
+    """Caps how much work of one kind a worker runs at once.
+
+    Up to `limit` holders run concurrently. Beyond that, up to `queue_size`
+    callers wait in FIFO order for at most `timeout` seconds. A caller that
+    finds the queue full, or times out in it, is rejected so the worker sheds
+    load instead of slowing down every session it already serves. A `limit`
+    of 0 admits everything. Use from the event loop only.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.stats = {"admitted": 0, "queued": 0, "rejected_full": 0, "rejected_timeout": 0}
+        _controllers.append(self)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for w in self._waiters if not w.done())
+
+    def would_wait(self) -> bool:
+        return self.limit > 0 and (self.in_use >= self.limit or self.queue_depth > 0)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed. False means rejected."""
+        if not self.would_wait():
+            self.in_use += 1
+            self.stats["admitted"] += 1
+            return True
+        if self.queue_depth >= self.queue_size:
+            self.stats["rejected_full"] += 1
+            return False
+
+        self.stats["queued"] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # A slot handed over just as the caller gave up is passed on.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.stats["rejected_timeout"] += 1
+            return False
+        finally:
+            stage_seconds.observe(f"admission_wait_{self.name}", time.perf_counter() - started)
+        self.stats["admitted"] += 1
+        return True
+
+    def release(self):
+        # Hand the slot straight to the oldest live waiter, so a newcomer
+        # can't overtake the queue between release and wake-up.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_use -= 1
+
+
+_controllers: List[AdmissionController] = []
+
+
+def admission_gauges():
+    for controller in _controllers:
+        labels = {"pool": controller.name}
+        yield "vakya_admission_in_use", labels, controller.in_use
+        yield "vakya_admission_limit", labels, controller.limit
+        yield "vakya_admission_queue_depth", labels, controller.queue_depth
+        for stat, value in controller.stats.items():
+            yield "vakya_admission_total", {**labels, "event": stat}, value
+
+
+metrics.register_collector(admission_gauges)
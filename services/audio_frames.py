@@ -0,0 +1,20 @@
+import base64
+import struct
+
+# Binary audio frame sent to the browser:
+#   byte 0    frame type (AUDIO_FRAME)
+#   byte 1    codec (see CODECS)
+#   bytes 2-5 big-endian uint32 sequence number within the turn
+#   bytes 6-  raw audio bytes
+AUDIO_FRAME = 0x01
+CODECS = {"MP3": 0, "WAV": 1, "PCM": 2}
+HEADER = struct.Struct(">BBI")
+
+
+def pack_audio_frame(seq: int, codec: str, b64_audio: str) -> bytes:
+    """Decode Murf's base64 audio once and prefix the frame header."""
+    return pack_audio_bytes(seq, codec, base64.b64decode(b64_audio))
+
+
+def pack_audio_bytes(seq: int, codec: str, audio: bytes) -> bytes:
+    return HEADER.pack(AUDIO_FRAME, CODECS.get(codec, 0), seq) + audio
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+import weakref
+from typing import Callable, Dict
+
+from services.metrics import metrics, stage_seconds
+
+SAMPLE_RATE = 16000
+BYTES_PER_MS = SAMPLE_RATE * 2 // 1000  # PCM16 mono
+# AssemblyAI streaming accepts 50-1000 ms of audio per message.
+MAX_PACKET_MS = 1000
+
+_totals_lock = threading.Lock()
+_totals: Dict[str, int] = {
+    "frames_in": 0,
+    "bytes_in": 0,
+    "packets_sent": 0,
+    "bytes_sent": 0,
+    "bytes_dropped": 0,
+    "drop_events": 0,
+    "send_errors": 0,
+}
+_live: "weakref.WeakSet[AudioIngestor]" = weakref.WeakSet()
+
+
+class AudioIngestor:
+    """Hands microphone audio to a blocking `send` on a dedicated thread.
+
+    `push` only appends to a bounded buffer, so a slow upstream never stalls
+    the event loop. The sender thread coalesces whatever has accumulated into
+    packets of at least `packet_ms` (waiting at most `linger_ms` for a short
+    packet to fill) and at most 1000 ms. If more than `buffer_ms` of audio is
+    waiting, the oldest audio is dropped: for live transcription the newest
+    speech matters most, and a stale backlog would only delay every turn.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], None],
+        packet_ms: int = 100,
+        buffer_ms: int = 2000,
+        linger_ms: int = 50,
+    ):
+        self.send = send
+        self.packet_bytes = packet_ms * BYTES_PER_MS
+        self.max_packet_bytes = MAX_PACKET_MS * BYTES_PER_MS
+        self.max_buffered_bytes = max(buffer_ms * BYTES_PER_MS, self.max_packet_bytes)
+        self.linger = linger_ms / 1000
+        self.stats = dict.fromkeys(_totals, 0)
+        self._buf = bytearray()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._failed = False
+        self._thread = threading.Thread(target=self._run, name="audio-ingest", daemon=True)
+        self._thread.start()
+        _live.add(self)
+
+    @property
+    def buffered_bytes(self) -> int:
+        return len(self._buf)
+
+    def push(self, frame: bytes):
+        """Queue one PCM16 frame; never blocks on the upstream."""
+        with self._cond:
+            if self._closed:
+                return
+            self._count("frames_in", 1)
+            self._count("bytes_in", len(frame))
+            if self._failed:
+                self._count("bytes_dropped", len(frame))
+                return
+            if len(frame) % 2:
+                # A half sample would shift every later sample by one byte.
+                self._count("bytes_dropped", 1)
+                frame = frame[:-1]
+            self._buf += frame
+            overflow = len(self._buf) - self.max_buffered_bytes
+            if overflow > 0:
+                overflow += overflow % 2  # keep samples aligned
+                del self._buf[:overflow]
+                self._count("bytes_dropped", overflow)
+                self._count("drop_events", 1)
+            self._cond.notify()
+
+    def close(self, timeout: float = 1.0):
+        """Send what is buffered, then stop the sender thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and len(self._buf) < self.packet_bytes:
+                    if self._buf:
+                        # Send a short packet if no more audio arrives soon.
+                        if not self._cond.wait(self.linger):
+                            break
+                    else:
+                        self._cond.wait()
+                if self._closed and len(self._buf) < 2:
+                    self._count("bytes_dropped", len(self._buf))
+                    self._buf.clear()
+                    return  # closed and drained
+                size = min(len(self._buf), self.max_packet_bytes)
+                size -= size % 2
+                packet = bytes(self._buf[:size])
+                del self._buf[:size]
+            if not packet:
+                continue
+            started = time.perf_counter()
+            try:
+                self.send(packet)
+            except Exception as e:
+                logging.error(f"Audio ingest: upstream send failed, dropping further audio: {e}")
+                with self._cond:
+                    self._failed = True
+                    self._count("send_errors", 1)
+                    self._count("bytes_dropped", len(packet) + len(self._buf))
+                    self._buf.clear()
+                continue
+            stage_seconds.observe("stt_send", time.perf_counter() - started)
+            self._count("packets_sent", 1)
+            self._count("bytes_sent", len(packet))
+
+    def _count(self, stat: str, n: int):
+        self.stats[stat] += n
+        with _totals_lock:
+            _totals[stat] += n
+
+
+def ingest_gauges():
+    with _totals_lock:
+        totals = dict(_totals)
+    for stat, value in totals.items():
+        yield "vakya_audio_ingest_total", {"event": stat}, value
+    yield "vakya_audio_ingest_buffered_bytes", {}, sum(i.buffered_bytes for i in list(_live))
+
+
+metrics.register_collector(ingest_gauges)
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+from services.cache import TTLCache
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    text = str(exc).lower()
+    return getattr(exc, "status_code", None) == 429 or "429" in text or "rate limit" in text
+
+
+def _is_retryable(exc: Exception) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    # Bad input (empty transcript, invalid text) fails the same way every time.
+    return not isinstance(exc, (ValueError, TypeError))
+
+
+class BatchRunner:
+    """Fan a batch of blocking upstream calls out over a bounded thread pool.
+
+    The pool is private to the runner, so batch jobs never compete with the
+    realtime pipeline for the default executor. Failed calls are retried with
+    exponential backoff and jitter. A rate-limit response makes every worker
+    of the runner wait out a shared cooldown. Items are identified by a
+    content hash: duplicates inside a batch, and across concurrent or recent
+    batches, share a single upstream call through a TTLCache of results.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        result_ttl: float = 86400.0,
+        max_results: int = 512,
+    ):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"batch-{name}")
+        self.results = TTLCache(f"batch_{name}", ttl=result_ttl, max_size=max_results)
+        self._cooldown_until = 0.0
+        self.stats = {"items": 0, "deduplicated": 0, "retries": 0, "rate_limited": 0, "failed": 0}
+
+    async def _call(self, fn: Callable[[Any], Any], payload: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, self.max_attempts + 1):
+            wait = self._cooldown_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await loop.run_in_executor(self.executor, fn, payload)
+            except Exception as e:
+                if attempt == self.max_attempts or not _is_retryable(e):
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                delay *= 1 + random.random()
+                if _is_rate_limited(e):
+                    self.stats["rate_limited"] += 1
+                    delay = max(delay, self.max_delay / 2)
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+                self.stats["retries"] += 1
+                logging.warning(f"Batch '{self.name}': attempt {attempt} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def run(
+        self, items: List[Tuple[str, Any]], fn: Callable[[Any], Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one result dict per (content_hash, payload) item as it completes.
+
+        Abandoning the iterator doesn't cancel calls already started; their
+        results still land in the cache, so resubmitting the batch is cheap.
+        """
+        indices: Dict[str, List[int]] = {}
+        payloads: Dict[str, Any] = {}
+        for i, (key, payload) in enumerate(items):
+            indices.setdefault(key, []).append(i)
+            payloads.setdefault(key, payload)
+        self.stats["items"] += len(items)
+        self.stats["deduplicated"] += len(items) - len(indices)
+
+        async def process(key: str):
+            try:
+                result = await self.results.get_or_fetch(key, lambda: self._call(fn, payloads[key]))
+                return key, {"status": "ok", "result": result}
+            except Exception as e:
+                self.stats["failed"] += 1
+                return key, {"status": "error", "error": str(e)}
+
+        for done in asyncio.as_completed([process(key) for key in indices]):
+            key, outcome = await done
+            first, *duplicates = indices[key]
+            yield {"index": first, **outcome}
+            for i in duplicates:
+                yield {"index": i, "duplicate_of": first, **outcome}
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """Async LRU cache with per-cache TTL, stale-while-revalidate and request coalescing.
+
+    Entries younger than `ttl` are served directly. Entries older than `ttl`
+    but younger than `ttl + stale_ttl` are served immediately while a single
+    background refresh runs. Concurrent misses for the same key share one
+    upstream call.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0, max_size: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+        caches[name] = self
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            # The upstream call runs as its own task so one cancelled caller
+            # doesn't abort the fetch for everyone else waiting on it.
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._store(key, task.result())
+
+    async def _revalidate(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        try:
+            await self._fetch(key, fetch)
+        except Exception as e:
+            logging.warning(f"Cache '{self.name}': background refresh failed: {e}")
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    asyncio.create_task(self._revalidate(key, fetch))
+                return entry[1]
+        self.stats["misses"] += 1
+        return await self._fetch(key, fetch)
+
+
+# Every cache registers itself here so its stats can be reported.
+caches: Dict[str, TTLCache] = {}
+
+# Geocodes essentially never change; forecasts and headlines drift slowly.
+geocode_cache = TTLCache("geocode", ttl=7 * 24 * 3600, max_size=4096)
+forecast_cache = TTLCache("forecast", ttl=10 * 60, stale_ttl=20 * 60, max_size=1024)
+headlines_cache = TTLCache("headlines", ttl=15 * 60, stale_ttl=45 * 60, max_size=256)
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from services.metrics import TOKEN_BUCKETS, metrics
+
+ROLE_LABELS = {"user": "User", "assistant": "Assistant"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text).
+
+    Good enough for budgeting; an exact count would need a network call.
+    """
+    return max(1, len(text) // 4)
+
+
+prompt_tokens = metrics.histogram(
+    "vakya_prompt_tokens", "Estimated tokens per Gemini prompt.", "kind", TOKEN_BUCKETS
+)
+# Messages at the end of the covered span kept to re-find it once the store
+# has trimmed the start of the history.
+COVERED_TAIL = 4
+
+
+def _format_turn(turn: Dict[str, str]) -> str:
+    return f"{ROLE_LABELS.get(turn['role'], turn['role'])}: {turn['message']}"
+
+
+class ContextWindow:
+    """Assemble Gemini prompts from session history under a token budget.
+
+    The most recent turns are included verbatim, newest first, until
+    `budget_tokens` is used up. Everything older is folded into a rolling
+    summary that is cached per session and refreshed in the background, so
+    the summarization call never sits on the response path. A refresh only
+    runs once `refresh_turns` turns or `refresh_tokens` tokens (default
+    `summary_tokens`) have aged out past the summary; until then they are
+    appended to it verbatim, so summarizing costs one LLM call per batch of
+    turns rather than one per turn.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = 1500,
+        summary_tokens: int = 300,
+        max_sessions: int = 1000,
+        refresh_turns: int = 8,
+        refresh_tokens: Optional[int] = None,
+    ):
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = summary_tokens
+        self.max_sessions = max_sessions
+        self.refresh_turns = refresh_turns
+        self.refresh_tokens = refresh_tokens or summary_tokens
+        # session_id -> (summary, messages of history folded into it, the last
+        # few of those messages)
+        self._summaries: "OrderedDict[str, Tuple[str, int, tuple]]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def build_prompt(
+        self,
+        session_id: str,
+        history: List[Dict[str, str]],
+        persona_instruction: str,
+        transcript: str,
+        model=None,
+    ) -> Tuple[str, int]:
+        """Return the prompt and its estimated token count."""
+        # The current user turn is already recorded; it's quoted separately.
+        if history and history[-1]["role"] == "user" and history[-1]["message"] == transcript:
+            history = history[:-1]
+
+        header = f"You are {persona_instruction}\n"
+        footer = (
+            f"The user just said: \"{transcript}\"\n"
+            f"Respond concisely in character. Do not use markdown."
+        )
+        remaining = self.budget_tokens - estimate_tokens(header + footer) - self.summary_tokens
+
+        recent: List[str] = []
+        split = len(history)
+        for i in range(len(history) - 1, -1, -1):
+            line = _format_turn(history[i])
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                break
+            recent.append(line)
+            remaining -= cost
+            split = i
+        recent.reverse()
+
+        summary = self._summary_for(session_id, history, split, model)
+
+        parts = [header]
+        if summary:
+            parts.append(f"Summary of the earlier conversation: {summary}\n")
+        if recent:
+            parts.append("Recent conversation:\n" + "\n".join(recent) + "\n")
+        parts.append(footer)
+        prompt = "".join(parts)
+        tokens = estimate_tokens(prompt)
+        prompt_tokens.observe("reply", tokens)
+        return prompt, tokens
+
+    def _summary_for(self, session_id: str, history: List[Dict[str, str]], split: int, model) -> str:
+        """Summary of `history[:split]`, the turns too old for the prompt."""
+        if not split:
+            return ""
+        summary, covered, tail = self._summaries.get(session_id, ("", 0, ()))
+        if session_id in self._summaries:
+            self._summaries.move_to_end(session_id)
+
+        # Only the turns after the ones already folded in need summarizing.
+        start = self._covered_end(history, covered, tail)
+        if start >= split:
+            return summary
+        new_turns = history[start:split]
+        pending = " ".join(_format_turn(t) for t in new_turns)
+        due = len(new_turns) >= self.refresh_turns or estimate_tokens(pending) >= self.refresh_tokens
+        if due and session_id not in self._refreshing:
+            task = asyncio.create_task(self._refresh(session_id, summary, history[:split], start, model))
+            self._refreshing[session_id] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(session_id, None))
+        # Until a refresh lands, carry the turns not yet folded in verbatim.
+        return self._truncate(f"{summary} {pending}".strip())
+
+    @staticmethod
+    def _covered_end(history: List[Dict[str, str]], covered: int, tail: tuple) -> int:
+        """Index in `history` just past the messages the summary already covers.
+
+        The history only grows at the end, so this is `covered` until the
+        store starts trimming its oldest messages; then the covered span has
+        moved towards the start and is found again by its last few messages
+        (or, once those are partly trimmed too, by two or more left at the very
+        start). A lone repeated message ("Okay.") can't be mistaken for it.
+        """
+        n = len(tail)
+        for end in range(min(covered, len(history)), n - 1, -1):
+            if tuple(history[end - n:end]) == tail:
+                return end
+        for end in range(min(n - 1, len(history)), 1, -1):
+            if tuple(history[:end]) == tail[-end:]:
+                return end
+        return 0
+    def _truncate(self, summary: str) -> str:
+        # Keep the tail; the most recent facts matter most.
+        max_chars = self.summary_tokens * 4
+        return summary[-max_chars:] if len(summary) > max_chars else summary
+
+    async def _refresh(self, session_id: str, summary: str, older: List[Dict[str, str]], start: int, model):
+        new_turns = older[start:]
+        transcript = "\n".join(_format_turn(t) for t in new_turns)
+        updated = None
+        if model is not None:
+            prompt = (
+                f"Update this running summary of a voice conversation in at most "
+                f"{self.summary_tokens * 3 // 4} words. Keep names, places and facts the "
+                f"user mentioned.\nCurrent summary: {summary or '(none)'}\n"
+                f"New turns:\n{transcript}\nUpdated summary:"
+            )
+            prompt_tokens.observe("summary", estimate_tokens(prompt))
+            try:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(None, model.generate_content, prompt)
+                updated = (response.text or "").strip()
+            except Exception as e:
+                logging.warning(f"Context summary refresh failed, using extractive summary: {e}")
+        if not updated:
+            updated = f"{summary} {transcript.replace(chr(10), ' ')}".strip()
+        updated = self._truncate(updated)
+        self._summaries[session_id] = (updated, len(older), tuple(older[-COVERED_TAIL:]))
+        self._summaries.move_to_end(session_id)
+        while len(self._summaries) > self.max_sessions:
+            self._summaries.popitem(last=False)
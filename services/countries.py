@@ -0,0 +1,72 @@
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import pycountry
+
+# Special cases / abbreviations not covered by pycountry names.
+COMMON_ALIASES = {
+    "usa": "us",
+    "uk": "gb",
+    "uae": "ae",
+    "america": "us",
+    "britain": "gb",
+    "england": "gb",
+    "russia": "ru",
+    "iran": "ir",
+    "syria": "sy",
+    "venezuela": "ve",
+    "bolivia": "bo",
+    "tanzania": "tz",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_index: Optional[Dict[Tuple[str, ...], str]] = None
+_first_tokens = frozenset()
+_max_phrase_len = 0
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip accents and split into word tokens."""
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(text.lower())
+
+
+def build_index() -> Dict[Tuple[str, ...], str]:
+    """Map every country name, official name, common name and alias (as a
+    token tuple) to its lowercase ISO 3166-1 alpha-2 code."""
+    global _index, _first_tokens, _max_phrase_len
+    index: Dict[Tuple[str, ...], str] = {}
+    for country in pycountry.countries:
+        code = country.alpha_2.lower()
+        for attr in ("name", "official_name", "common_name"):
+            name = getattr(country, attr, None)
+            if name:
+                index.setdefault(tuple(tokenize(name)), code)
+    for alias, code in COMMON_ALIASES.items():
+        index.setdefault((alias,), code)
+    _index = index
+    _first_tokens = frozenset(phrase[0] for phrase in index)
+    _max_phrase_len = max(len(phrase) for phrase in index)
+    return index
+
+
+def extract_country_code(user_message: str) -> Optional[str]:
+    """
+    Detect a country name in the user's message and return its ISO 3166-1 alpha-2 code.
+    Example: "India" -> "in", "United States" -> "us"
+
+    Single left-to-right pass over the message tokens, preferring the longest
+    phrase at each position so "Guinea-Bissau" beats "Guinea".
+    """
+    index = _index if _index is not None else build_index()
+    tokens = tokenize(user_message)
+    for start in range(len(tokens)):
+        if tokens[start] not in _first_tokens:
+            continue
+        for length in range(min(_max_phrase_len, len(tokens) - start), 0, -1):
+            code = index.get(tuple(tokens[start:start + length]))
+            if code:
+                return code
+    return None
@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from google.generativeai import GenerativeModel
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+
+class GeminiClientRegistry:
+    """GenerativeModel instances bound to their own API key, shared across sessions.
+
+    `genai.configure` sets one process-wide key, so sessions bringing their
+    own keys would race each other. Each entry here instead owns a private
+    client manager configured for one key, so its HTTP/gRPC transport is
+    built once and reused by every turn that uses that key. The least
+    recently used entries are dropped beyond `max_clients`.
+    """
+
+    def __init__(self, max_clients: int = 32, endpoint: Optional[str] = None):
+        self.max_clients = max_clients
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+        self._models: "OrderedDict[Tuple[str, str], GenerativeModel]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __len__(self):
+        return len(self._models)
+
+    def get(self, api_key: str, model_name: str = DEFAULT_MODEL) -> "GenerativeModel":
+        key = (api_key, model_name)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.stats["hits"] += 1
+                return model
+            self.stats["misses"] += 1
+            model = self._build(api_key, model_name)
+            self._models[key] = model
+            while len(self._models) > self.max_clients:
+                self._models.popitem(last=False)
+                self.stats["evictions"] += 1
+            return model
+
+    def _build(self, api_key: str, model_name: str) -> "GenerativeModel":
+        # Imported on first use: the SDK takes most of a second to load.
+        import google.generativeai as genai
+        from google.generativeai import client as genai_client
+
+        manager = genai_client._ClientManager()
+        if self.endpoint:
+            manager.configure(
+                api_key=api_key, transport="rest", client_options={"api_endpoint": self.endpoint}
+            )
+        else:
+            manager.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name)
+        # The SDK has no public hook for a per-model client; GenerativeModel
+        # only falls back to the global default client while `_client` is None.
+        model._client = manager.get_default_client("generative")
+        return model
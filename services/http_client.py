@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+# Per-host request timeouts (seconds) and max in-flight requests.
+HOST_TIMEOUTS = {
+    "geocoding-api.open-meteo.com": 5.0,
+    "api.open-meteo.com": 5.0,
+    "newsapi.org": 8.0,
+}
+HOST_CONCURRENCY = {
+    "newsapi.org": 4,
+}
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CONCURRENCY = 16
+
+# httpx logs full request URLs at INFO, which would leak query-string API keys.
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class UpstreamError(RuntimeError):
+    """An upstream answered with an HTTP error or an error payload."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SkillHTTPClient:
+    """Shared keep-alive HTTP client used by every skill."""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+                timeout=DEFAULT_TIMEOUT,
+            )
+        return self._client
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(
+                HOST_CONCURRENCY.get(host, DEFAULT_CONCURRENCY)
+            )
+        return sem
+
+    async def get_json(self, url: str, params: Optional[dict] = None) -> dict:
+        """GET a JSON body. Raises UpstreamError on a non-2xx status or an
+        Open-Meteo style `{"error": true}` payload, so callers that cache the
+        result never store a failure."""
+        host = urlsplit(url).hostname or ""
+        timeout = HOST_TIMEOUTS.get(host, DEFAULT_TIMEOUT)
+        async with self._semaphore(host):
+            resp = await self.client.get(url, params=params, timeout=timeout)
+        try:
+            data = resp.json()
+        except ValueError:
+            data = None
+        if resp.is_success and not (isinstance(data, dict) and data.get("error") is True):
+            return data
+        reason = None
+        if isinstance(data, dict):
+            reason = data.get("reason") or data.get("message")
+        raise UpstreamError(reason or f"{host} returned HTTP {resp.status_code}", resp.status_code)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logging.info("Skill HTTP client closed.")
+
+
+http_client = SkillHTTPClient()
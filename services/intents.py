@@ -0,0 +1,101 @@
+import re
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class Intent:
+    """A skill the router can dispatch a transcript to.
+
+    `keywords` are matched as whole words/phrases, case-insensitively.
+    `patterns` are extra raw regexes (e.g. anchored forms) that also count
+    as a hit; they run against the lowercased transcript. `slots` extract
+    named values from the transcript once the intent wins. Lower `priority`
+    wins ties between intents. `prefetch` marks skills whose result is safe
+    to fetch speculatively from a partial transcript.
+    """
+
+    name: str
+    keywords: Sequence[str]
+    handler: Callable[[str, Dict[str, Optional[str]]], Awaitable[str]]
+    patterns: Sequence[str] = ()
+    slots: Dict[str, Callable[[str], Optional[str]]] = field(default_factory=dict)
+    priority: int = 100
+    prefetch: bool = False
+
+
+@dataclass
+class IntentMatch:
+    intent: Intent
+    score: int
+    slots: Dict[str, Optional[str]]
+
+
+class IntentRouter:
+    """Route a transcript to registered skills with one precompiled regex scan."""
+
+    def __init__(self):
+        self.intents: Dict[str, Intent] = {}
+        self._group_to_intent: Dict[str, str] = {}
+        self._combined: Optional[re.Pattern] = None
+
+    def register(self, intent: Intent):
+        self.intents[intent.name] = intent
+        self._compile()
+
+    def _compile(self):
+        # All keyword lists share one word-boundary group so the regex engine
+        # tries them together at each position; extra patterns follow.
+        keyword_groups, pattern_groups = [], []
+        self._group_to_intent = {}
+        for intent in self.intents.values():
+            if intent.keywords:
+                group = f"{intent.name}__kw"
+                words = sorted((w.lower() for w in intent.keywords), key=len, reverse=True)
+                keyword_groups.append(f"(?P<{group}>" + "|".join(re.escape(w) for w in words) + ")")
+                self._group_to_intent[group] = intent.name
+            for i, source in enumerate(intent.patterns):
+                group = f"{intent.name}__{i}"
+                pattern_groups.append(f"(?P<{group}>{source})")
+                self._group_to_intent[group] = intent.name
+        alternatives = []
+        if keyword_groups:
+            alternatives.append(r"\b(?:" + "|".join(keyword_groups) + r")\b")
+        alternatives.extend(pattern_groups)
+        self._combined = re.compile("|".join(alternatives)) if alternatives else None
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Count keyword/pattern hits per intent in a single pass."""
+        hits: Dict[str, int] = {}
+        if self._combined is None:
+            return hits
+        for m in self._combined.finditer(text.lower()):
+            name = self._group_to_intent[m.lastgroup]
+            hits[name] = hits.get(name, 0) + 1
+        return hits
+
+    def route(self, text: str) -> List[IntentMatch]:
+        """All matching intents, best first, with their slots extracted."""
+        hits = self.scan(text)
+        ranked = sorted(
+            hits.items(),
+            key=lambda item: (-item[1], self.intents[item[0]].priority),
+        )
+        matches = []
+        for name, score in ranked:
+            intent = self.intents[name]
+            slots = {slot: extract(text) for slot, extract in intent.slots.items()}
+            matches.append(IntentMatch(intent, score, slots))
+        return matches
+
+    def best(self, text: str) -> Optional[IntentMatch]:
+        hits = self.scan(text)
+        if not hits:
+            return None
+        name = min(hits, key=lambda n: (-hits[n], self.intents[n].priority))
+        intent = self.intents[name]
+        slots = {slot: extract(text) for slot, extract in intent.slots.items()}
+        return IntentMatch(intent, hits[name], slots)
+
+
+intent_router = IntentRouter()
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator
+
+# Chunks buffered between the Gemini reader thread and the event loop.
+# When the consumer falls behind the reader thread blocks instead of
+# buffering the whole reply.
+QUEUE_SIZE = 8
+
+_DONE = object()
+
+
+async def stream_gemini(model, prompt, queue_size: int = QUEUE_SIZE) -> AsyncIterator[str]:
+    """Yield Gemini text chunks without blocking the event loop.
+
+    The blocking SDK iterator runs in a worker thread that feeds a bounded
+    asyncio.Queue. Cancelling (or closing) the consuming generator signals
+    the thread to stop reading the upstream stream.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+    def produce():
+        try:
+            response = model.generate_content(prompt, stream=True)
+            for chunk in response:
+                if stop.is_set():
+                    logging.info("Gemini stream abandoned by consumer.")
+                    return
+                text = getattr(chunk, "text", "")
+                if text:
+                    put(text)
+        except Exception as e:
+            if not stop.is_set():
+                put(e)
+        finally:
+            if not stop.is_set():
+                put(_DONE)
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Free a slot so a producer blocked on a full queue can observe `stop`.
+        while not queue.empty():
+            queue.get_nowait()
+        if producer.done():
+            producer.exception()
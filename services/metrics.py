@@ -0,0 +1,212 @@
+import asyncio
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets (seconds) shared by all pipeline histograms.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (100, 250, 500, 750, 1000, 1500, 2000, 3000, 4000, 8000)
+QUANTILES = (0.5, 0.95, 0.99)
+# Recent samples kept per series for quantile estimates.
+WINDOW = 1024
+
+
+class Histogram:
+    """Prometheus-style histogram that also reports p50/p95/p99 over recent samples."""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # label value -> [bucket counts, sum, count, recent samples]
+        self._series: Dict[str, list] = {}
+
+    def observe(self, label_value: str, value: float):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [
+                    [0] * len(self.buckets), 0.0, 0, deque(maxlen=WINDOW)
+                ]
+            i = bisect.bisect_left(self.buckets, value)
+            if i < len(self.buckets):
+                series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+            series[3].append(value)
+
+    def quantiles(self, label_value: str) -> Dict[float, float]:
+        with self._lock:
+            series = self._series.get(label_value)
+            samples = sorted(series[3]) if series else []
+        if not samples:
+            return {}
+        return {q: samples[min(len(samples) - 1, int(q * len(samples)))] for q in QUANTILES}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v[0]), v[1], v[2]) for k, v in sorted(self._series.items())]
+        for label_value, counts, total, count in items:
+            labels = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        # Quantiles go in their own gauge family so the histogram stays valid.
+        lines.append(f"# HELP {self.name}_recent {self.help_text} Quantiles over the last {WINDOW} samples.")
+        lines.append(f"# TYPE {self.name}_recent gauge")
+        for label_value, _, _, _ in items:
+            for q, v in self.quantiles(label_value).items():
+                lines.append(f'{self.name}_recent{{{self.label}="{label_value}",quantile="{q}"}} {v}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        # Callables returning (name, labels, value) gauge samples at scrape time.
+        self._collectors: List[Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]] = []
+
+    def histogram(self, name: str, help_text: str, label: str, buckets=LATENCY_BUCKETS) -> Histogram:
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(name, help_text, label, buckets)
+        return self.histograms[name]
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in self.histograms.values():
+            lines.extend(histogram.render())
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+stage_seconds = metrics.histogram(
+    "vakya_stage_seconds", "Duration of each voice pipeline stage.", "stage"
+)
+turn_elapsed_seconds = metrics.histogram(
+    "vakya_turn_elapsed_seconds", "Time from end of user speech to each pipeline milestone.", "event"
+)
+
+
+class TurnTrace:
+    """Timings for one user turn, from end of speech to the end of the reply.
+
+    `span` records how long a stage took; `mark` records a milestone as time
+    elapsed since the turn started. Both feed the process-wide histograms and
+    are kept on the trace so they can be sent to the client.
+    """
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    def mark(self, event: str) -> float:
+        if event in self.timings:
+            return self.timings[event]
+        elapsed = time.perf_counter() - self.started_at
+        self.timings[event] = elapsed
+        turn_elapsed_seconds.observe(event, elapsed)
+        return elapsed
+
+    def span(self, stage: str) -> "_Span":
+        return _Span(self, stage)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {k: round(v * 1000, 1) for k, v in self.timings.items()}
+
+
+class _Span:
+    def __init__(self, trace: TurnTrace, stage: str):
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        self.trace.timings[f"{self.stage}_duration"] = duration
+        stage_seconds.observe(self.stage, duration)
+        return False
+
+
+event_loop_lag_seconds = metrics.histogram(
+    "vakya_event_loop_lag_seconds", "How late the event loop woke a sleeping timer.", "loop"
+)
+
+
+async def monitor_event_loop_lag(interval: float = 0.25):
+    """Sample event-loop lag forever; a blocked loop shows up as large lag."""
+    while True:
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        event_loop_lag_seconds.observe("main", max(0.0, time.perf_counter() - scheduled))
+
+
+def process_gauges():
+    try:
+        with open("/proc/self/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        yield "process_resident_memory_bytes", {}, rss_pages * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource  # Unix only; /proc covers Linux.
+
+        # ru_maxrss is KiB on Linux; this fallback reports peak, not current, RSS.
+        yield "process_resident_memory_bytes", {}, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+metrics.register_collector(process_gauges)
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process started (Linux only, 10 ms resolution)."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimer:
+    """Cold-start breakdown: time from process start to creation, then each phase."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        age = process_age()
+        if age is not None:
+            self.phases["boot_and_imports"] = age
+        self._last = time.perf_counter()
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    def summary(self) -> str:
+        parts = [f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in self.phases.items()]
+        return ", ".join(parts) + f" (total {sum(self.phases.values()) * 1000:.0f} ms)"
+
+    def gauges(self):
+        for phase, seconds in self.phases.items():
+            yield "vakya_startup_seconds", {"phase": phase}, seconds
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+import websockets
+from websockets.protocol import State
+
+MURF_STREAM_URL = os.getenv("MURF_STREAM_URL", "wss://api.murf.ai/v1/speech/stream-input")
+
+# Seconds between keepalive pings on an idle socket.
+PING_INTERVAL = 20.0
+# Idle sockets (no open context) older than this are closed by the reaper.
+IDLE_TTL = 300.0
+
+
+class MurfConnection:
+    """One warm Murf stream-input socket shared by many turns via context_id."""
+
+    def __init__(self, key: Tuple[str, str, str, int, str]):
+        self.key = key
+        self.ws = None
+        self.reader_task: Optional[asyncio.Task] = None
+        self.contexts: Dict[str, asyncio.Queue] = {}
+        self.last_used = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def uri(self) -> str:
+        api_key, _, _, sample_rate, fmt = self.key
+        return (
+            f"{MURF_STREAM_URL}?api-key={api_key}"
+            f"&sample_rate={sample_rate}&channel_type=MONO&format={fmt}"
+        )
+
+    @property
+    def healthy(self) -> bool:
+        return (
+            self.ws is not None
+            and self.ws.state is State.OPEN
+            and self.reader_task is not None
+            and not self.reader_task.done()
+        )
+
+    async def connect(self):
+        async with self._lock:
+            if self.healthy:
+                return
+            _, voice_id, style, _, _ = self.key
+            self.ws = await websockets.connect(self.uri, ping_interval=PING_INTERVAL)
+            await self.ws.send(
+                json.dumps({"voice_config": {"voiceId": voice_id, "style": style}})
+            )
+            self.reader_task = asyncio.create_task(self._read_loop())
+            logging.info(f"Murf pool: connected socket for voice {voice_id}")
+
+    async def _read_loop(self):
+        """Route every Murf message to the queue of the context it belongs to."""
+        try:
+            async for raw in self.ws:
+                response = json.loads(raw)
+                queue = self.contexts.get(response.get("context_id"))
+                if queue is None and len(self.contexts) == 1:
+                    # Some messages (errors) come back without a context_id.
+                    queue = next(iter(self.contexts.values()))
+                if queue is not None:
+                    queue.put_nowait(response)
+        except websockets.ConnectionClosed:
+            pass
+        except Exception as e:
+            logging.error(f"Murf pool reader error: {e}")
+        finally:
+            # Wake every waiting turn so none of them hangs on a dead socket.
+            for queue in self.contexts.values():
+                queue.put_nowait(None)
+
+    def open_context(self) -> "MurfContext":
+        context_id = f"voice-agent-context-{uuid.uuid4().hex}"
+        self.contexts[context_id] = asyncio.Queue()
+        self.last_used = time.monotonic()
+        return MurfContext(self, context_id)
+
+    def release_context(self, context_id: str):
+        self.contexts.pop(context_id, None)
+        self.last_used = time.monotonic()
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self.reader_task is not None:
+            self.reader_task.cancel()
+
+
+class MurfContext:
+    """A single turn on a pooled Murf socket."""
+
+    def __init__(self, connection: MurfConnection, context_id: str):
+        self.connection = connection
+        self.context_id = context_id
+        self.queue = connection.contexts[context_id]
+
+    async def send_text(self, text: str, end: bool = False):
+        await self.connection.ws.send(
+            json.dumps({"text": text, "end": end, "context_id": self.context_id})
+        )
+
+    async def recv(self) -> Optional[dict]:
+        """Next Murf message for this turn, or None if the socket died."""
+        return await self.queue.get()
+
+    async def clear(self):
+        """Ask Murf to drop any audio still pending for this context."""
+        try:
+            await self.connection.ws.send(
+                json.dumps({"context_id": self.context_id, "clear": True})
+            )
+        except websockets.ConnectionClosed:
+            pass
+
+    def release(self):
+        self.connection.release_context(self.context_id)
+
+
+class MurfPool:
+    """Per-process pool of warm Murf sockets keyed by api key, voice and format."""
+
+    def __init__(self):
+        self.connections: Dict[Tuple[str, str, str, int, str], MurfConnection] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+
+    async def acquire(
+        self,
+        api_key: str,
+        voice_id: str,
+        style: str = "Conversational",
+        sample_rate: int = 44100,
+        fmt: str = "MP3",
+    ) -> MurfContext:
+        key = (api_key, voice_id, style, sample_rate, fmt)
+        conn = self.connections.get(key)
+        if conn is None:
+            conn = self.connections[key] = MurfConnection(key)
+        if not conn.healthy:
+            if conn.ws is not None:
+                logging.warning("Murf pool: evicting dead socket, reconnecting.")
+            await conn.connect()
+        self._ensure_reaper()
+        return conn.open_context()
+
+    def _ensure_reaper(self):
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_loop())
+
+    async def _reap_loop(self):
+        """Close idle sockets and reconnect dropped ones in the background."""
+        while self.connections:
+            await asyncio.sleep(PING_INTERVAL)
+            now = time.monotonic()
+            for key, conn in list(self.connections.items()):
+                if not conn.contexts and now - conn.last_used > IDLE_TTL:
+                    self.connections.pop(key, None)
+                    await conn.close()
+                elif not conn.healthy:
+                    try:
+                        await conn.connect()
+                    except Exception as e:
+                        logging.warning(f"Murf pool: background reconnect failed: {e}")
+
+    async def close(self):
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+        for conn in list(self.connections.values()):
+            await conn.close()
+        self.connections.clear()
+
+
+murf_pool = MurfPool()
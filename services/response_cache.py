@@ -0,0 +1,198 @@
+import re
+import time
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from services.cache import caches
+
+# Words that carry no meaning for lookup ("please tell me the weather in X").
+FILLER_WORDS = {
+    "a", "an", "the", "please", "tell", "me", "can", "could", "would", "you", "hey",
+    "hi", "ok", "okay", "so", "um", "uh", "just", "give", "i", "want", "to", "know",
+    "about", "what", "whats", "is", "are", "in", "at", "for", "of", "do", "does",
+}
+# A query containing any of these depends on the conversation so far, and
+# its answer must not be reused for another turn.
+CONTEXTUAL_WORDS = {
+    "it", "its", "that", "this", "these", "those", "they", "them", "their", "he",
+    "him", "his", "she", "her", "more", "again", "else", "previous", "earlier",
+    "last", "also", "too", "then", "above", "same", "my", "we", "us", "our",
+}
+# Answers to these go stale within the TTL ("what's today's date").
+TIME_SENSITIVE_WORDS = {
+    "today", "todays", "tonight", "tomorrow", "tomorrows", "yesterday", "yesterdays",
+    "now", "date", "time", "day", "week", "month", "year", "current", "currently",
+    "latest", "recent", "recently", "clock",
+}
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_query(text: str) -> Tuple[str, ...]:
+    """Content words in spoken order; filler words don't change the key.
+
+    Order is kept: "is 3 greater than 2" and "is 2 greater than 3" are
+    different questions with different answers.
+    """
+    tokens = _TOKEN_RE.findall(text.lower().replace("'", ""))
+    return tuple(t for t in tokens if t not in FILLER_WORDS)
+
+
+def _near_identical(a: str, b: str) -> bool:
+    """The same word, up to a plural ending ("capital" / "capitals")."""
+    short, long = sorted((a, b), key=len)
+    return long == short or long in (short + "s", short + "es")
+
+
+def _near_duplicate(a: Tuple[str, ...], b: Tuple[str, ...]) -> bool:
+    """Same words in the same order, except for word-for-word near-identical swaps.
+
+    An added, dropped or moved word, or a swap like "necessary" for
+    "unnecessary", makes a different question.
+    """
+    for op, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if op == "equal":
+            continue
+        if op != "replace" or i2 - i1 != j2 - j1:
+            return False
+        if not all(_near_identical(x, y) for x, y in zip(a[i1:i2], b[j1:j2])):
+            return False
+    return True
+
+
+def _shingles(tokens: Iterable[str]) -> FrozenSet[str]:
+    # Character trigrams within each word tolerate plurals and STT spelling drift.
+    grams = set()
+    for token in tokens:
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class ResponseCache:
+    """Reply text cached per (persona, intent, normalized query) with per-intent TTLs.
+
+    Lookups for intents in `fuzzy_intents` (general LLM answers) also accept
+    a near-duplicate query: one with the same content words in the same
+    order, up to plural endings, and whose character-trigram Jaccard
+    similarity is at least `similarity`. Numbers must match exactly, since
+    "2 plus 3" and "2 plus 4" look alike, and "rupees to dollars" is not
+    "dollars to rupees".
+    Those answers come from the LLM, so they are only cached outside a
+    conversation (`in_conversation=False`), and never for queries that
+    refer back to it or that ask about the current date or time.
+    An intent with no TTL (or TTL 0) is never cached.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttls: Dict[str, float],
+        max_entries: int = 2000,
+        similarity: float = 0.8,
+        fuzzy_intents: Iterable[str] = ("llm",),
+    ):
+        self.name = name
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.fuzzy_intents = set(fuzzy_intents)
+        # (persona, intent, tokens) -> (expires_at, reply, shingles)
+        self._entries: "OrderedDict[tuple, Tuple[float, str, FrozenSet[str]]]" = OrderedDict()
+        # (persona, intent, word) -> keys containing that word, for fuzzy candidates.
+        self._by_word: Dict[tuple, Set[tuple]] = {}
+        self.stats = {"hits": 0, "similar_hits": 0, "misses": 0, "stores": 0, "skipped": 0, "evictions": 0}
+        caches[name] = self
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cacheable(self, intent: str, query: str, in_conversation: bool = False) -> bool:
+        if not self.ttls.get(intent):
+            return False
+        tokens = normalize_query(query)
+        if not tokens:
+            return False
+        if intent not in self.fuzzy_intents:
+            return True
+        return not (
+            in_conversation
+            or CONTEXTUAL_WORDS.intersection(tokens)
+            or TIME_SENSITIVE_WORDS.intersection(tokens)
+        )
+
+    def get(self, persona: str, intent: str, query: str, in_conversation: bool = False) -> Optional[str]:
+        if not self.cacheable(intent, query, in_conversation):
+            self.stats["skipped"] += 1
+            return None
+        tokens = normalize_query(query)
+        key = (persona, intent, tokens)
+        now = time.monotonic()
+        reply = self._live(key, now)
+        if reply is not None:
+            self.stats["hits"] += 1
+            return reply
+        if intent in self.fuzzy_intents:
+            reply = self._similar(persona, intent, tokens, now)
+            if reply is not None:
+                self.stats["similar_hits"] += 1
+                return reply
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, persona: str, intent: str, query: str, reply: str, in_conversation: bool = False):
+        if not reply or not self.cacheable(intent, query, in_conversation):
+            return
+        tokens = normalize_query(query)
+        key = (persona, intent, tokens)
+        self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttls[intent], reply, _shingles(tokens))
+        if intent in self.fuzzy_intents:
+            for word in tokens:
+                self._by_word.setdefault((persona, intent, word), set()).add(key)
+        self.stats["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def _live(self, key: tuple, now: float) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _similar(self, persona: str, intent: str, tokens: Tuple[str, ...], now: float) -> Optional[str]:
+        candidates: Set[tuple] = set()
+        for word in tokens:
+            candidates.update(self._by_word.get((persona, intent, word), ()))
+        if not candidates:
+            return None
+        numbers = [t for t in tokens if t.isdigit()]
+        shingles = _shingles(tokens)
+        best_key, best_score = None, self.similarity
+        for key in candidates:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now or [t for t in key[2] if t.isdigit()] != numbers:
+                continue
+            if not _near_duplicate(tokens, key[2]):
+                continue
+            other = entry[2]
+            score = len(shingles & other) / len(shingles | other)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return self._live(best_key, now) if best_key is not None else None
+
+    def _drop(self, key: tuple):
+        if self._entries.pop(key, None) is None:
+            return
+        persona, intent, tokens = key
+        for word in set(tokens):
+            keys = self._by_word.get((persona, intent, word))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_word[(persona, intent, word)]
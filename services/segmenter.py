@@ -0,0 +1,111 @@
+import re
+import time
+from typing import List, Optional
+
+# Words ending in "." that don't end a sentence.
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "approx", "fig", "mt", "inc", "ltd", "co", "a.m", "p.m", "u.s", "u.k",
+}
+SENTENCE_END = ".?!"
+CLAUSE_END = ",;:"
+# Candidate boundaries: punctuation followed by whitespace.
+_BOUNDARY_RE = re.compile(r"[.?!,;:](?=\s)")
+_WORD_RE = re.compile(r"\S+")
+
+
+class SentenceSegmenter:
+    """Split streamed LLM text into speakable segments as it arrives.
+
+    Only text after the last flushed segment is kept and each character is
+    scanned once, so cost is linear in the reply length. A sentence ends at
+    ".", "?" or "!" followed by whitespace, except after abbreviations and
+    single-letter initials (but not the words "I" and "a"); decimals like "3.5" never qualify because no
+    whitespace follows the dot, and an ellipsis ends only at its last dot.
+
+    To cut time-to-first-audio, the first segment of a reply may be flushed
+    early: at a comma/semicolon/colon once it has `first_clause_min_words`
+    words, or at a word boundary once it reaches `first_clause_max_words`
+    words or `first_clause_ms` milliseconds have passed since the first text.
+    """
+
+    def __init__(
+        self,
+        first_clause_min_words: int = 4,
+        first_clause_max_words: int = 12,
+        first_clause_ms: Optional[float] = 600.0,
+    ):
+        self.first_clause_min_words = first_clause_min_words
+        self.first_clause_max_words = first_clause_max_words
+        self.first_clause_ms = first_clause_ms
+        self._buf = ""
+        self._scan = 0
+        self._first = True
+        self._started_at: Optional[float] = None
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any segments ready to be spoken."""
+        if not text:
+            return []
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        buf = self._buf + text
+        segments: List[str] = []
+        start = 0
+        for m in _BOUNDARY_RE.finditer(buf, self._scan):
+            i = m.start()
+            c = buf[i]
+            if c in SENTENCE_END:
+                if not (c == "." and self._is_abbreviation(buf, start, i)):
+                    start = self._emit(buf, start, i + 1, segments)
+            elif self._first and not segments:
+                if len(buf[start:i].split()) >= self.first_clause_min_words:
+                    start = self._emit(buf, start, i + 1, segments)
+
+        if self._first and not segments:
+            start = self._maybe_flush_first(buf, segments)
+        if segments:
+            self._first = False
+        self._buf = buf[start:]
+        # The last character may be punctuation still waiting for its whitespace.
+        self._scan = max(0, len(self._buf) - 1)
+        return segments
+
+    def flush(self) -> str:
+        """Return whatever text is left at the end of the stream."""
+        rest = self._buf.strip()
+        self._buf = ""
+        self._scan = 0
+        return rest
+
+    @staticmethod
+    def _emit(buf: str, start: int, end: int, segments: List[str]) -> int:
+        segment = buf[start:end].strip()
+        if segment:
+            segments.append(segment)
+        return end
+
+    @staticmethod
+    def _is_abbreviation(buf: str, start: int, dot: int) -> bool:
+        j = dot
+        while j > start and not buf[j - 1].isspace():
+            j -= 1
+        word = buf[j:dot].lower().lstrip("(\"'")
+        if word in ABBREVIATIONS:
+            return True
+        return len(word) == 1 and word.isalpha() and word not in ("i", "a")
+
+    def _maybe_flush_first(self, buf: str, segments: List[str]) -> int:
+        # Only words followed by whitespace count, so a half-streamed word is
+        # never spoken; a long clause is cut right after its N-th word.
+        ends = [m.end() for m in _WORD_RE.finditer(buf) if m.end() < len(buf)]
+        if len(ends) < self.first_clause_min_words:
+            return 0
+        elapsed_ms = (time.perf_counter() - self._started_at) * 1000
+        too_long = len(ends) >= self.first_clause_max_words
+        too_slow = self.first_clause_ms is not None and elapsed_ms >= self.first_clause_ms
+        if too_long:
+            return self._emit(buf, 0, ends[self.first_clause_max_words - 1], segments)
+        if too_slow:
+            return self._emit(buf, 0, ends[-1], segments)
+        return 0
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Roles are stored as one-character codes to keep per-turn overhead small.
+ROLE_CODES = {"user": "u", "assistant": "a"}
+CODE_ROLES = {v: k for k, v in ROLE_CODES.items()}
+
+
+class SessionStore(ABC):
+    """Chat history shared by the REST endpoints and the /ws pipeline.
+
+    Each session keeps at most `max_turns` messages, sessions idle for more
+    than `idle_ttl` seconds are dropped, and no more than `max_sessions`
+    sessions are kept (least recently used first out). Code on the event
+    loop uses the `*_async` methods, which keep blocking backends off it.
+    """
+
+    def __init__(self, max_turns: int = 50, idle_ttl: float = 3600.0, max_sessions: int = 1000):
+        self.max_turns = max_turns
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+
+    @abstractmethod
+    def append(self, session_id: str, role: str, message: str):
+        ...
+
+    @abstractmethod
+    def history(self, session_id: str) -> Optional[List[Dict[str, str]]]:
+        """Messages for a session as {"role", "message"} dicts, or None if unknown."""
+
+    @abstractmethod
+    def evict_idle(self) -> int:
+        ...
+
+    async def append_async(self, session_id: str, role: str, message: str):
+        await asyncio.to_thread(self.append, session_id, role, message)
+
+    async def history_async(self, session_id: str) -> Optional[List[Dict[str, str]]]:
+        return await asyncio.to_thread(self.history, session_id)
+
+
+class MemorySessionStore(SessionStore):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        # session_id -> (last_seen, deque of (role_code, message))
+        self._sessions: "OrderedDict[str, Tuple[float, Deque[Tuple[str, str]]]]" = OrderedDict()
+
+    def append(self, session_id: str, role: str, message: str):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            turns = entry[1] if entry else deque(maxlen=self.max_turns)
+            turns.append((ROLE_CODES.get(role, role), message))
+            self._sessions[session_id] = (now, turns)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._maybe_evict(now)
+
+    def history(self, session_id: str) -> Optional[List[Dict[str, str]]]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            return [{"role": CODE_ROLES.get(r, r), "message": m} for r, m in entry[1]]
+
+    def evict_idle(self) -> int:
+        cutoff = time.monotonic() - self.idle_ttl
+        evicted = 0
+        with self._lock:
+            # Sessions are ordered by last use, so stop at the first fresh one.
+            while self._sessions:
+                session_id, (last_seen, _) = next(iter(self._sessions.items()))
+                if last_seen >= cutoff:
+                    break
+                self._sessions.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    # Pure in-memory work under a short lock: cheaper inline than a thread hop.
+    async def append_async(self, session_id: str, role: str, message: str):
+        self.append(session_id, role, message)
+
+    async def history_async(self, session_id: str) -> Optional[List[Dict[str, str]]]:
+        return self.history(session_id)
+
+    def _maybe_evict(self, now: float):
+        if self._sessions:
+            oldest = next(iter(self._sessions.values()))[0]
+            if now - oldest > self.idle_ttl:
+                self.evict_idle()
+
+
+class SQLiteSessionStore(SessionStore):
+    """File-backed store so history survives restarts and is shared by workers."""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                message TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, id);
+            CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen);
+            """
+        )
+        self._appends = 0
+
+    def append(self, session_id: str, role: str, message: str):
+        now = time.time()
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                cur.execute(
+                    "INSERT INTO sessions (session_id, last_seen) VALUES (?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET last_seen = excluded.last_seen",
+                    (session_id, now),
+                )
+                cur.execute(
+                    "INSERT INTO messages (session_id, role, message) VALUES (?, ?, ?)",
+                    (session_id, ROLE_CODES.get(role, role), message),
+                )
+                cur.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND id NOT IN "
+                    "(SELECT id FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?)",
+                    (session_id, session_id, self.max_turns),
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            self._appends += 1
+        # Sweeping on every append would be wasteful; every 100th is plenty.
+        if self._appends % 100 == 0:
+            self.evict_idle()
+
+    def history(self, session_id: str) -> Optional[List[Dict[str, str]]]:
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if not known:
+                return None
+            rows = self._conn.execute(
+                "SELECT role, message FROM messages WHERE session_id = ? ORDER BY id",
+                (session_id,),
+            ).fetchall()
+        return [{"role": CODE_ROLES.get(r, r), "message": m} for r, m in rows]
+
+    def evict_idle(self) -> int:
+        cutoff = time.time() - self.idle_ttl
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                cur.execute("SELECT session_id FROM sessions WHERE last_seen < ?", (cutoff,))
+                stale = [row[0] for row in cur.fetchall()]
+                overflow = cur.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - len(stale)
+                if overflow > self.max_sessions:
+                    cur.execute(
+                        "SELECT session_id FROM sessions WHERE last_seen >= ? "
+                        "ORDER BY last_seen LIMIT ?",
+                        (cutoff, overflow - self.max_sessions),
+                    )
+                    stale.extend(row[0] for row in cur.fetchall())
+                cur.executemany("DELETE FROM messages WHERE session_id = ?", [(s,) for s in stale])
+                cur.executemany("DELETE FROM sessions WHERE session_id = ?", [(s,) for s in stale])
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        if stale:
+            logging.info(f"Session store: evicted {len(stale)} sessions.")
+        return len(stale)
+
+
+def create_session_store(backend: str, **kwargs) -> SessionStore:
+    if backend == "sqlite":
+        path = kwargs.pop("path")
+        return SQLiteSessionStore(path, **kwargs)
+    kwargs.pop("path", None)
+    return MemorySessionStore(**kwargs)
@@ -0,0 +1,83 @@
+import asyncio
+import concurrent.futures
+import logging
+import string
+import threading
+from typing import Optional
+
+from services.intents import IntentMatch, IntentRouter
+
+
+def _match_key(match: IntentMatch):
+    # Partial and formatted transcripts differ in casing and punctuation
+    # ("paris" vs "Paris?"), which the skills ignore anyway.
+    slots = tuple(
+        sorted((k, (v or "").strip(string.punctuation + " ").lower()) for k, v in match.slots.items())
+    )
+    return (match.intent.name, slots)
+
+
+class SkillSpeculator:
+    """Prefetch skill data from partial transcripts before the turn ends.
+
+    `observe` is called from the AssemblyAI callback thread with each partial
+    transcript. Once the routed intent and its slots have been identical for
+    `stable_after` partials, the skill handler is started on the event loop.
+    When the final turn arrives `take` hands back the in-flight result if the
+    final transcript routed to the same intent and slots, otherwise the
+    speculation is cancelled and discarded.
+    """
+
+    def __init__(self, router: IntentRouter, loop: asyncio.AbstractEventLoop, stable_after: int = 2):
+        self.router = router
+        self.loop = loop
+        self.stable_after = stable_after
+        self._lock = threading.Lock()
+        self._candidate = None
+        self._seen = 0
+        self._active_key = None
+        self._active: Optional[concurrent.futures.Future] = None
+        self.stats = {"started": 0, "committed": 0, "discarded": 0}
+
+    def observe(self, partial_text: str):
+        match = self.router.best(partial_text)
+        if match is None or not match.intent.prefetch:
+            return
+        key = _match_key(match)
+        with self._lock:
+            if key != self._candidate:
+                self._candidate, self._seen = key, 0
+            self._seen += 1
+            if self._seen < self.stable_after or key == self._active_key:
+                return
+            self._cancel_active()
+            logging.info(f"Speculatively prefetching '{match.intent.name}' with slots {match.slots}")
+            self._active_key = key
+            self._active = asyncio.run_coroutine_threadsafe(
+                match.intent.handler(partial_text, match.slots), self.loop
+            )
+            self.stats["started"] += 1
+
+    def take(self, match: Optional[IntentMatch]) -> Optional[concurrent.futures.Future]:
+        """Claim the speculation for the final turn's routed intent, if it matches."""
+        with self._lock:
+            future, key = self._active, self._active_key
+            self._active = self._active_key = self._candidate = None
+            self._seen = 0
+            if future is None:
+                return None
+            if match is not None and key == _match_key(match):
+                self.stats["committed"] += 1
+                return future
+            future.cancel()
+            self.stats["discarded"] += 1
+            return None
+
+    def reset(self):
+        self.take(None)
+
+    def _cancel_active(self):
+        if self._active is not None:
+            self._active.cancel()
+            self.stats["discarded"] += 1
+            self._active = self._active_key = None
@@ -0,0 +1,92 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import List, Optional
+
+
+class SpeechAudioCache:
+    """Content-addressed cache of synthesized Murf audio.
+
+    Entries are the base64 chunks exactly as Murf streamed them, keyed by a
+    hash of (text, voice, style, format, sample rate), so a hit replays the
+    same frames the client would have received live. Memory is an LRU bounded
+    by total base64 size. Files under `disk_dir` survive restarts, which is
+    what makes pre-warming the static phrase set a one-time cost.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 2**20, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.bytes = 0
+        self._entries: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(text: str, voice: str, style: str, fmt: str, sample_rate: int) -> str:
+        raw = "\x1f".join((text.strip(), voice, style, fmt.upper(), str(sample_rate)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[List[str]]:
+        chunks = self._entries.get(key)
+        if chunks is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return chunks
+        if self.disk_dir:
+            chunks = await asyncio.to_thread(self._read, key)
+            if chunks:
+                self.stats["disk_hits"] += 1
+                self._remember(key, chunks)
+                return chunks
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, chunks: List[str]):
+        if not chunks:
+            return
+        self.stats["stores"] += 1
+        self._remember(key, chunks)
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(self._write, key, chunks)
+            except OSError as e:
+                logging.warning(f"TTS cache: could not write {key[:12]} to disk: {e}")
+
+    def _remember(self, key: str, chunks: List[str]):
+        size = sum(len(c) for c in chunks)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= sum(len(c) for c in old)
+        self._entries[key] = chunks
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= sum(len(c) for c in evicted)
+            self.stats["evictions"] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[List[str]]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, chunks: List[str]):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(chunks, f)
+        os.replace(tmp, path)
@@ -0,0 +1,138 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from services.metrics import metrics
+
+# Codecs the browser client can play chunk by chunk: each MP3 chunk decodes
+# on its own, and PCM needs no decoding at all. PCM is 16-bit mono.
+STREAM_FORMATS = ("MP3", "PCM")
+# The rates Murf's stream-input API accepts; others are rejected upstream.
+SAMPLE_RATES = (8000, 24000, 44100, 48000)
+DEFAULT_SAMPLE_RATES = {"MP3": 44100, "PCM": 24000}
+PCM_SAMPLE_WIDTH = 2
+VOICE_ID_RE = re.compile(r"^[a-z]{2}-[a-z]{2}-[a-z]+$", re.IGNORECASE)
+
+# Layer III bitrates (kbps) by bitrate index, for MPEG-1 and MPEG-2/2.5.
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+@dataclass(frozen=True)
+class TtsOutput:
+    """Voice and audio encoding one session's replies are synthesized in."""
+
+    voice: str
+    style: str = "Conversational"
+    fmt: str = "MP3"
+    sample_rate: int = 44100
+
+    def describe(self) -> dict:
+        return {"voice": self.voice, "format": self.fmt, "sample_rate": self.sample_rate}
+
+
+def canonical_voice_id(voice: str) -> str:
+    """Murf ids are case-insensitive; "en-IN-Isha" and "en-in-isha" are "en-IN-isha".
+
+    One spelling per voice keeps the socket pool and audio cache from
+    splitting one voice across several keys.
+    """
+    language, region, name = voice.split("-", 2)
+    return f"{language.lower()}-{region.upper()}-{name.lower()}"
+
+
+def negotiate_output(
+    default: TtsOutput,
+    voice: Optional[str] = None,
+    fmt: Optional[str] = None,
+    sample_rate: Optional[str] = None,
+    binary_audio: bool = True,
+) -> TtsOutput:
+    """Settle a session's voice, codec and sample rate from client query params.
+
+    Anything missing or unsupported falls back to `default`. PCM is only
+    offered over binary frames; JSON clients decode every chunk as MP3.
+    """
+    voice = canonical_voice_id(voice) if voice and VOICE_ID_RE.match(voice) else default.voice
+    fmt = (fmt or "").upper()
+    if fmt not in STREAM_FORMATS or (fmt == "PCM" and not binary_audio):
+        fmt = default.fmt
+    try:
+        rate = int(sample_rate)
+    except (TypeError, ValueError):
+        rate = None
+    if rate not in SAMPLE_RATES:
+        rate = default.sample_rate if fmt == default.fmt else DEFAULT_SAMPLE_RATES[fmt]
+    if rate not in SAMPLE_RATES:
+        rate = DEFAULT_SAMPLE_RATES[fmt]
+    return TtsOutput(voice, default.style, fmt, rate)
+
+
+def mp3_bitrate(data: bytes) -> Optional[int]:
+    """Bitrate in bits/s of the first Layer III frame header in `data`."""
+    for i in range(len(data) - 3):
+        if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+            continue
+        version = (data[i + 1] >> 3) & 0x03
+        layer = (data[i + 1] >> 1) & 0x03
+        index = data[i + 2] >> 4
+        if version == 0x01 or layer != 0x01 or index in (0, 15) or (data[i + 2] >> 2) & 0x03 == 3:
+            continue
+        return _MP3_BITRATES[1 if version == 0x03 else 2][index] * 1000
+    return None
+
+
+class AudioFramer:
+    """Cuts one turn's synthesized audio into frames the client can play on arrival.
+
+    PCM frames always hold whole samples, since a Murf chunk may end halfway
+    through one. The first frame is cut at `first_frame_ms` and later ones at
+    `max_frame_ms`, so playback can start before a long chunk has fully
+    crossed a slow link. MP3 chunks pass through unchanged. Bytes and
+    seconds of audio are counted per format.
+    """
+
+    def __init__(self, output: TtsOutput, first_frame_ms: int = 40, max_frame_ms: int = 250):
+        self.output = output
+        self._carry = b""
+        self._bitrate: Optional[int] = None
+        self._started = False
+        self.first_frame_bytes = self._frame_bytes(first_frame_ms)
+        self.max_frame_bytes = self._frame_bytes(max_frame_ms)
+
+    def _frame_bytes(self, ms: int) -> int:
+        return max(1, self.output.sample_rate * ms // 1000) * PCM_SAMPLE_WIDTH
+
+    def frames(self, audio: bytes) -> List[bytes]:
+        totals = _totals.setdefault(self.output.fmt, {"bytes": 0, "seconds": 0.0})
+        totals["bytes"] += len(audio)
+        if self.output.fmt != "PCM":
+            self._bitrate = self._bitrate or mp3_bitrate(audio)
+            if self._bitrate:
+                totals["seconds"] += len(audio) * 8 / self._bitrate
+            return [audio] if audio else []
+        data = self._carry + audio
+        whole = len(data) - len(data) % PCM_SAMPLE_WIDTH
+        self._carry = data[whole:]
+        totals["seconds"] += whole / PCM_SAMPLE_WIDTH / self.output.sample_rate
+        frames, start = [], 0
+        if whole and not self._started:
+            self._started = True
+            frames.append(data[:min(whole, self.first_frame_bytes)])
+            start = len(frames[0])
+        frames += [data[i:min(whole, i + self.max_frame_bytes)] for i in range(start, whole, self.max_frame_bytes)]
+        return frames
+
+
+_totals: Dict[str, Dict[str, float]] = {}
+
+
+def tts_format_gauges():
+    for fmt, totals in list(_totals.items()):
+        yield "vakya_tts_audio_bytes_total", {"format": fmt}, totals["bytes"]
+        yield "vakya_tts_audio_seconds_total", {"format": fmt}, totals["seconds"]
+
+
+metrics.register_collector(tts_format_gauges)
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Coroutine, Optional
+
+from services.metrics import stage_seconds
+
+# How long to wait for a cancelled turn to tear down before moving on.
+TEARDOWN_TIMEOUT = 2.0
+
+
+class TurnController:
+    """Owns the in-flight reply task for one /ws connection.
+
+    Starting a new turn while one is still running cancels the old task and
+    waits for it to tear down (Gemini reader stopped, Murf context cleared,
+    audio forwarding stopped) before telling the client to drop queued audio
+    and starting the new turn, so no stale frame can follow the interrupt.
+    Starts and cancels are serialized, so two starts overlapping in the
+    teardown window can't both leave a task running. `start` and `cancel`
+    are safe to call from the AssemblyAI callback thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, on_interrupt: Callable[[], Awaitable[None]]):
+        self.loop = loop
+        self.on_interrupt = on_interrupt
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, coro: Coroutine):
+        return asyncio.run_coroutine_threadsafe(self._start(coro), self.loop)
+
+    def cancel(self):
+        return asyncio.run_coroutine_threadsafe(self._cancel(), self.loop)
+
+    async def _start(self, coro: Coroutine):
+        async with self._lock:
+            await self._cancel_current()
+            self._task = asyncio.create_task(coro)
+
+    async def _cancel(self):
+        async with self._lock:
+            await self._cancel_current()
+
+    async def _cancel_current(self, notify: bool = True):
+        task = self._task
+        if task is None or task.done():
+            return
+        logging.warning("User interrupted. Cancelling previous response.")
+        started = time.perf_counter()
+        task.cancel()
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=TEARDOWN_TIMEOUT)
+        except asyncio.CancelledError:
+            if not task.done():
+                raise
+        except asyncio.TimeoutError:
+            logging.error("Previous turn did not stop within the teardown timeout.")
+        except Exception:
+            pass
+        stage_seconds.observe("barge_in_teardown", time.perf_counter() - started)
+        if not notify:
+            return
+        try:
+            await self.on_interrupt()
+        except Exception as e:
+            logging.warning(f"Could not notify client of interruption: {e}")
+
+    async def close(self):
+        async with self._lock:
+            await self._cancel_current(notify=False)
@@ -0,0 +1,105 @@
+import threading
+from collections import deque
+from typing import Dict
+
+import numpy as np
+
+from services.metrics import metrics
+
+_totals_lock = threading.Lock()
+_totals: Dict[str, int] = {"bytes_in": 0, "bytes_forwarded": 0, "speech_starts": 0}
+
+
+class VoiceActivityGate:
+    """Energy-based VAD that drops long silences from 16 kHz PCM16 audio.
+
+    Each incoming chunk is split into `window_ms` windows and their RMS is
+    computed in one vectorized pass. A window is speech when its RMS exceeds
+    both `min_rms` and `threshold_ratio` times an adaptive noise floor.
+    Audio keeps flowing for `hangover_ms` after the last speech window, and
+    must cover AssemblyAI's end-of-turn silence or turns would never finish.
+    While suppressed, the last `preroll_ms` are held back and sent ahead of
+    the next speech so word onsets aren't clipped.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        window_ms: int = 20,
+        threshold_ratio: float = 3.0,
+        min_rms: float = 300.0,
+        preroll_ms: int = 300,
+        hangover_ms: int = 2500,
+    ):
+        self.window = sample_rate * window_ms // 1000
+        self.threshold_ratio = threshold_ratio
+        self.min_rms = min_rms
+        self.hangover_windows = hangover_ms // window_ms
+        self.preroll: deque = deque(maxlen=max(1, preroll_ms // window_ms))
+        self.noise_floor = min_rms / threshold_ratio
+        # Start suppressed: nothing is forwarded until the first speech.
+        self._quiet_run = self.hangover_windows + 1
+        self.stats = dict.fromkeys(_totals, 0)
+
+    @property
+    def in_speech(self) -> bool:
+        return self._quiet_run <= self.hangover_windows
+
+    def process(self, chunk: bytes) -> bytes:
+        """Return the part of `chunk` (plus any pre-roll) to send upstream."""
+        samples = np.frombuffer(chunk, dtype="<i2", count=len(chunk) // 2)
+        if not len(samples):
+            return b""
+        n = max(1, len(samples) // self.window)
+        # The last window absorbs any remainder shorter than a full window.
+        edges = [i * self.window * 2 for i in range(n)] + [len(samples) * 2]
+        frames = samples[: n * self.window] if len(samples) >= self.window else samples
+        frames = frames.reshape(n, -1).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        loud = rms > max(self.min_rms, self.noise_floor * self.threshold_ratio)
+
+        quiet = rms[~loud]
+        if len(quiet):
+            self.noise_floor = 0.9 * self.noise_floor + 0.1 * float(np.median(quiet))
+
+        out = bytearray()
+        starts = 0
+        for i, is_loud in enumerate(loud.tolist()):
+            segment = chunk[edges[i]:edges[i + 1]]
+            if is_loud:
+                if not self.in_speech:
+                    out += b"".join(self.preroll)
+                    starts += 1
+                self.preroll.clear()
+                self._quiet_run = 0
+                out += segment
+            else:
+                self._quiet_run += 1
+                if self.in_speech:
+                    out += segment
+                else:
+                    self.preroll.append(segment)
+
+        self._count("bytes_in", len(chunk))
+        self._count("bytes_forwarded", len(out))
+        self._count("speech_starts", starts)
+        return bytes(out)
+
+    def _count(self, stat: str, n: int):
+        self.stats[stat] += n
+        with _totals_lock:
+            _totals[stat] += n
+
+
+def vad_gauges():
+    with _totals_lock:
+        totals = dict(_totals)
+    forwarded = min(totals["bytes_forwarded"], totals["bytes_in"])
+    yield "vakya_vad_bytes_total", {"decision": "forwarded"}, forwarded
+    yield "vakya_vad_bytes_total", {"decision": "suppressed"}, totals["bytes_in"] - forwarded
+    yield "vakya_vad_speech_starts_total", {}, totals["speech_starts"]
+    if totals["bytes_in"]:
+        yield "vakya_vad_suppressed_ratio", {}, 1 - forwarded / totals["bytes_in"]
+
+
+metrics.register_collector(vad_gauges)
@@ -9,6 +9,7 @@ document.addEventListener("DOMContentLoaded", () => {
   let playbackCtx = null;
   let playheadTime = 0;
   let decodeQueue = Promise.resolve();
+  let playbackGeneration = 0;
 
   let isRecording = false;
   let socket = null;
@@ -18,6 +19,8 @@ document.addEventListener("DOMContentLoaded", () => {
 
   let selectedPersona = "friendly";
   let selectedVoice = "en-IN-isha";
+  // Reply audio format the server agreed to; see the "session" message.
+  let outputSampleRate = 24000;
 
   /************************************************************
    * 🎛️ DOM Elements
@@ -80,31 +83,90 @@ document.getElementById("saveKeysBtn").onclick = () => {
     return bytes.buffer;
   }
 
-  async function decodeAndScheduleMp3(arrayBuffer) {
+  async function ensurePlaybackCtx() {
     if (!playbackCtx) {
       playbackCtx = new (window.AudioContext || window.webkitAudioContext)();
       playheadTime = playbackCtx.currentTime;
     }
     if (playbackCtx.state === "suspended") await playbackCtx.resume();
+  }
+
+  function scheduleBuffer(audioBuffer) {
+    const src = playbackCtx.createBufferSource();
+    src.buffer = audioBuffer;
+    src.connect(playbackCtx.destination);
 
+    const now = playbackCtx.currentTime;
+    if (playheadTime < now + 0.05) playheadTime = now + 0.05;
+    src.start(playheadTime);
+    playheadTime += audioBuffer.duration;
+  }
+
+  async function decodeAndScheduleMp3(arrayBuffer, generation) {
+    await ensurePlaybackCtx();
     try {
       const audioBuffer = await playbackCtx.decodeAudioData(arrayBuffer);
-      const src = playbackCtx.createBufferSource();
-      src.buffer = audioBuffer;
-      src.connect(playbackCtx.destination);
-
-      const now = playbackCtx.currentTime;
-      if (playheadTime < now + 0.05) playheadTime = now + 0.05;
-      src.start(playheadTime);
-      playheadTime += audioBuffer.duration;
+      if (generation !== playbackGeneration) return;
+      scheduleBuffer(audioBuffer);
     } catch (err) {
       console.error("MP3 decode error:", err);
     }
   }
 
+  // 16-bit little-endian mono PCM: no decode step, straight into a buffer.
+  async function scheduleRawPcm(arrayBuffer, generation) {
+    await ensurePlaybackCtx();
+    if (generation !== playbackGeneration) return;
+    const samples = new Int16Array(arrayBuffer);
+    const audioBuffer = playbackCtx.createBuffer(1, samples.length, outputSampleRate);
+    const channel = audioBuffer.getChannelData(0);
+    for (let i = 0; i < samples.length; i++) channel[i] = samples[i] / 0x8000;
+    scheduleBuffer(audioBuffer);
+  }
+
   function playAudioMp3Chunk(base64Mp3) {
-    const ab = base64ToArrayBuffer(base64Mp3);
-    decodeQueue = decodeQueue.then(() => decodeAndScheduleMp3(ab)).catch(err => {
+    scheduleDecode(base64ToArrayBuffer(base64Mp3));
+  }
+
+  // Binary frame: [type u8][codec u8][seq u32 BE][audio bytes]
+  const AUDIO_FRAME = 0x01;
+  const AUDIO_FRAME_HEADER_BYTES = 6;
+  const CODEC_PCM = 2;
+
+  function playAudioFrame(frame) {
+    const header = new DataView(frame, 0, AUDIO_FRAME_HEADER_BYTES);
+    if (header.getUint8(0) !== AUDIO_FRAME) return;
+    const schedule = header.getUint8(1) === CODEC_PCM ? scheduleRawPcm : decodeAndScheduleMp3;
+    scheduleDecode(frame.slice(AUDIO_FRAME_HEADER_BYTES), schedule);
+  }
+
+  // Raw PCM plays with no decoding but is ~6x the bytes of MP3, so slow or
+  // data-saving links ask for compressed audio. ?format=&rate= override.
+  function preferredAudioParams() {
+    const query = new URLSearchParams(window.location.search);
+    const connection = navigator.connection || {};
+    const slowLink = connection.saveData || /2g|3g/.test(connection.effectiveType || "");
+    const format = query.get("format") || (slowLink ? "mp3" : "pcm");
+    const rate = query.get("rate") || "24000";
+    return `&format=${format}&rate=${rate}`;
+  }
+
+  // Drop everything queued or playing from the interrupted reply.
+  function stopPlayback() {
+    playbackGeneration++;
+    decodeQueue = Promise.resolve();
+    if (playbackCtx) {
+      playbackCtx.close();
+      playbackCtx = null;
+    }
+    playheadTime = 0;
+  }
+
+  function scheduleDecode(ab, schedule = decodeAndScheduleMp3) {
+    const generation = playbackGeneration;
+    decodeQueue = decodeQueue.then(() => {
+      if (generation === playbackGeneration) return schedule(ab, generation);
+    }).catch(err => {
       console.error("Queue decode error, continuing:", err);
     });
   }
@@ -289,7 +351,9 @@ document.getElementById("saveKeysBtn").onclick = () => {
     echoErrorBox.style.display = "none";
     // Connect with updated persona and voice
       const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
-      socket = new WebSocket(`${protocol}//${window.location.host}/ws?persona=${selectedPersona}&voice=${selectedVoice}`);
+      const debugParam = new URLSearchParams(window.location.search).get("debug") === "1" ? "&debug=1" : "";
+      socket = new WebSocket(`${protocol}//${window.location.host}/ws?persona=${selectedPersona}&voice=${selectedVoice}&session=${currentSessionId}&audio=binary${preferredAudioParams()}${debugParam}`);
+      socket.binaryType = "arraybuffer";
 
     socket.onopen = () => {
       console.log("WebSocket connected");
@@ -305,11 +369,26 @@ document.getElementById("saveKeysBtn").onclick = () => {
     };
 
     socket.onmessage = event => {
+      if (event.data instanceof ArrayBuffer) {
+        playAudioFrame(event.data);
+        return;
+      }
       try {
         const msg = JSON.parse(event.data);
         if (msg.type === "transcription") addMessageToChat(msg.text, "user");
         else if (msg.type === "llm_chunk") addMessageToChat(msg.data, "ai");
         else if (msg.type === "audio") playAudioMp3Chunk(msg.data);
+        else if (msg.type === "audio_interrupt") stopPlayback();
+        else if (msg.type === "turn_timing") console.debug("Turn timing (ms):", msg.timings_ms);
+        else if (msg.type === "session") {
+          console.debug("Server session:", msg.id, msg.audio);
+          if (msg.audio) outputSampleRate = msg.audio.sample_rate;
+        }
+        else if (msg.type === "status") console.debug("Server status:", msg.message);
+        else if (msg.type === "busy") {
+          echoErrorBox.innerText = msg.message;
+          echoErrorBox.style.display = "block";
+        }
       } catch (err) {
         console.error("Bad WS message", err, event.data);
       }
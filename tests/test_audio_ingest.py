@@ -0,0 +1,19 @@
+from services.audio_ingest import AudioIngestor
+
+
+def test_close_with_odd_byte_stops_sender():
+    sent = []
+    ingestor = AudioIngestor(sent.append)
+    ingestor.push(b"\x01")
+    ingestor.close(timeout=1.0)
+    assert not ingestor._thread.is_alive()
+    assert sent == []
+
+
+def test_odd_frames_keep_samples_aligned():
+    sent = []
+    ingestor = AudioIngestor(sent.append)
+    ingestor.push(b"\x01\x02\x03")
+    ingestor.push(b"\x04\x05")
+    ingestor.close(timeout=1.0)
+    assert b"".join(sent) == b"\x01\x02\x04\x05"
@@ -0,0 +1,31 @@
+import asyncio
+
+from services.context_window import ContextWindow
+
+
+def turn(role, message):
+    return {"role": role, "message": message}
+
+
+def test_repeated_message_does_not_skip_turns():
+    async def run():
+        # A zero budget pushes every turn into the summary.
+        window = ContextWindow(budget_tokens=0, refresh_turns=2)
+        history = [turn("user", "hello"), turn("assistant", "Okay.")]
+        window.build_prompt("s1", history, "a friendly assistant.", "now")
+        await asyncio.sleep(0)
+        history += [turn("user", "my name is Ravi"), turn("assistant", "Okay."), turn("user", "I live in Pune")]
+        prompt, _ = window.build_prompt("s1", history, "a friendly assistant.", "now")
+        assert "my name is Ravi" in prompt and "I live in Pune" in prompt
+        assert prompt.count("hello") == 1
+
+    asyncio.run(run())
+
+
+def test_covered_span_is_found_after_trimming():
+    history = [turn("user" if i % 2 else "assistant", "Okay." if i % 3 else f"m{i}") for i in range(10)]
+    tail = tuple(history[2:6])
+    assert ContextWindow._covered_end(history, 6, tail) == 6
+    assert ContextWindow._covered_end(history[2:], 6, tail) == 4
+    assert ContextWindow._covered_end(history[4:], 6, tail) == 2
+    assert ContextWindow._covered_end(history[6:], 6, tail) == 0
@@ -0,0 +1,17 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Tell me a joke.", "Tell me some jokes.", "Any jokes?", "Say something funnier.", "I need a laugh.", "Keep me laughing."],
+)
+def test_joke_phrases_route_to_joke(text):
+    match = main.intent_router.best(text)
+    assert match is not None and match.intent.name == "joke"
+
+
+def test_unrelated_phrase_does_not_route_to_joke():
+    match = main.intent_router.best("What is the capital of France?")
+    assert match is None or match.intent.name != "joke"
@@ -0,0 +1,55 @@
+from services.response_cache import ResponseCache, normalize_query
+
+
+def make_cache(name):
+    return ResponseCache(name, ttls={"llm": 600, "weather": 600})
+
+
+def test_normalize_query_keeps_word_order():
+    assert normalize_query("Is 3 greater than 2?") == ("3", "greater", "than", "2")
+    assert normalize_query("is 3 greater than 2") != normalize_query("is 2 greater than 3")
+
+
+def test_reordered_operands_miss():
+    cache = make_cache("test_reordered_operands")
+    cache.put("friendly", "llm", "Is 2 greater than 3?", "No, 2 is less than 3.")
+    assert cache.get("friendly", "llm", "Is 3 greater than 2?") is None
+    assert cache.get("friendly", "llm", "is 2 greater than 3") == "No, 2 is less than 3."
+
+
+def test_reordered_words_miss_fuzzy_match():
+    cache = make_cache("test_reordered_words")
+    cache.put("friendly", "llm", "convert 10 dollars to rupees", "about 830 rupees")
+    assert cache.get("friendly", "llm", "convert 10 rupees to dollars") is None
+    assert cache.get("friendly", "llm", "please convert 10 dollars to rupees") == "about 830 rupees"
+
+
+def test_paraphrase_still_hits():
+    cache = make_cache("test_paraphrase")
+    cache.put("friendly", "llm", "what is the capital of france", "Paris.")
+    assert cache.get("friendly", "llm", "tell me the capital of france please") == "Paris."
+    assert cache.get("friendly", "llm", "capitals of france") == "Paris."
+
+
+def test_llm_replies_are_not_cached_mid_conversation():
+    cache = make_cache("test_in_conversation")
+    for query in ("Who am I?", "What did I just say?", "Why?", "Yes", "What about Paris?", "Sure, go ahead"):
+        assert not cache.cacheable("llm", query, in_conversation=True)
+    cache.put("friendly", "llm", "what is the capital of france", "Paris.", in_conversation=True)
+    assert cache.get("friendly", "llm", "what is the capital of france") is None
+    cache.put("friendly", "llm", "what is the capital of france", "Paris.")
+    assert cache.get("friendly", "llm", "what is the capital of france", in_conversation=True) is None
+    assert cache.cacheable("weather", "weather in paris", in_conversation=True)
+
+
+def test_time_sensitive_questions_are_not_cached():
+    cache = make_cache("test_time_sensitive")
+    for query in ("What's today's date?", "What time is it now?", "What day is it tomorrow?"):
+        assert not cache.cacheable("llm", query)
+
+
+def test_differing_words_must_be_near_identical():
+    cache = make_cache("test_near_identical")
+    cache.put("friendly", "llm", "spell the word necessary", "N-E-C-E-S-S-A-R-Y.")
+    assert cache.get("friendly", "llm", "spell the word unnecessary") is None
+    assert cache.get("friendly", "llm", "spell the words necessary") == "N-E-C-E-S-S-A-R-Y."
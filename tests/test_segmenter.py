@@ -0,0 +1,62 @@
+from services.segmenter import SentenceSegmenter
+
+
+def segment(chunks, **kwargs):
+    kwargs.setdefault("first_clause_ms", None)
+    segmenter = SentenceSegmenter(**kwargs)
+    segments = []
+    for chunk in chunks:
+        segments.extend(segmenter.feed(chunk))
+    rest = segmenter.flush()
+    return segments + ([rest] if rest else [])
+
+
+def test_abbreviations_and_initials_do_not_split():
+    text = "Dr. Smith met J. R. Tolkien at 5 p.m. yesterday. They talked."
+    assert segment([text]) == ["Dr. Smith met J. R. Tolkien at 5 p.m. yesterday.", "They talked."]
+
+
+def test_no_and_single_letter_words_end_sentences():
+    assert segment(["The short answer is no. Let me explain."]) == [
+        "The short answer is no.",
+        "Let me explain.",
+    ]
+    assert segment(["So do I. It is a good plan."]) == ["So do I.", "It is a good plan."]
+
+
+def test_decimals_do_not_split():
+    assert segment(["Pi is about 3.14 today. Nice."]) == ["Pi is about 3.14 today.", "Nice."]
+
+
+def test_ellipsis_ends_at_last_dot():
+    assert segment(["Well... I think so. Yes."]) == ["Well...", "I think so.", "Yes."]
+
+
+def test_first_clause_flushes_at_comma():
+    segments = segment(["Sure thing my friend, here is the full answer to that. Done."])
+    assert segments == ["Sure thing my friend,", "here is the full answer to that.", "Done."]
+
+
+def test_short_first_clause_waits_for_sentence_end():
+    assert segment(["Yes, it is. Done."]) == ["Yes, it is.", "Done."]
+
+
+def test_first_clause_flushes_at_word_limit():
+    segments = segment(["one two three four five six and more words"], first_clause_max_words=6)
+    assert segments == ["one two three four five six", "and more words"]
+    text = "one two three four five six and more words"
+    chunks = [text[i:i + 1] for i in range(len(text))]
+    assert segment(chunks, first_clause_max_words=6) == segments
+
+
+def test_chunk_boundaries_do_not_change_segments():
+    text = "Hello there friend, how are you doing today? I am fine. Dr. Who is 3.5 m tall... Really!"
+    whole = segment([text])
+    for size in (1, 2, 3, 7):
+        assert segment([text[i:i + size] for i in range(0, len(text), size)]) == whole
+
+
+def test_punctuation_at_chunk_end_waits_for_whitespace():
+    segmenter = SentenceSegmenter(first_clause_ms=None)
+    assert segmenter.feed("It costs 3.") == []
+    assert segmenter.feed("5 dollars. ") == ["It costs 3.5 dollars."]
@@ -0,0 +1,25 @@
+import itertools
+
+from services.tts_formats import SAMPLE_RATES, TtsOutput, negotiate_output
+
+MURF_SAMPLE_RATES = {8000, 24000, 44100, 48000}
+
+
+def test_sample_rates_are_murf_supported():
+    assert set(SAMPLE_RATES) <= MURF_SAMPLE_RATES
+
+
+def test_negotiate_output_only_returns_supported_rates():
+    defaults = [TtsOutput("en-IN-isha"), TtsOutput("en-IN-isha", fmt="PCM", sample_rate=24000),
+                TtsOutput("en-IN-isha", sample_rate=22050)]
+    formats = [None, "mp3", "PCM", "wav"]
+    rates = [None, "", "abc", "8000", "16000", "22050", "24000", "44100", "48000", "96000"]
+    for default, fmt, rate, binary in itertools.product(defaults, formats, rates, (True, False)):
+        output = negotiate_output(default, None, fmt, rate, binary_audio=binary)
+        assert output.sample_rate in MURF_SAMPLE_RATES, (default, fmt, rate, binary)
+
+
+def test_supported_rate_is_kept():
+    output = negotiate_output(TtsOutput("en-IN-isha"), "en-in-isha", "pcm", "8000")
+    assert (output.voice, output.fmt, output.sample_rate) == ("en-IN-isha", "PCM", 8000)
+    assert negotiate_output(TtsOutput("en-IN-isha"), fmt="mp3", sample_rate="16000").sample_rate == 44100